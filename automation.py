@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import time as _time
 from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime, time, timedelta
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Read-only stand-in for a missing trade leg record.
+_NO_LEG: Mapping[str, Any] = MappingProxyType({})
 
 
 def _default_primary_weekdays() -> List[int]:
@@ -14,11 +20,13 @@ def _default_wednesday() -> List[int]:
     return [2]
 
 
+_CLOSE_CONDITIONS = frozenset({"spread", "profit", "spread_and_profit"})
+
+
 def _normalise_close_condition(value: Optional[object]) -> str:
-    valid = {"spread", "profit", "spread_and_profit"}
     if isinstance(value, str):
         lowered = value.strip().lower()
-        if lowered in valid:
+        if lowered in _CLOSE_CONDITIONS:
             return lowered
     return "spread"
 
@@ -43,6 +51,11 @@ class ThreadSchedule:
     close_window_start: str = ""
     close_window_end: str = ""
     weekdays: List[int] = field(default_factory=_default_primary_weekdays)
+    # Membership set derived from ``weekdays``; an empty list means every day.
+    weekdays_set: frozenset = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.weekdays_set = frozenset(int(day) % 7 for day in self.weekdays) or frozenset(range(7))
 
     def to_dict(self) -> Dict[str, object]:
         return {
@@ -319,7 +332,7 @@ class AutomationState:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class TrackedTrade:
     trade_id: str
     opened_at: datetime
@@ -330,9 +343,15 @@ class TrackedTrade:
     min_combined_profit: float = 0.0
     close_window_start: Optional[time] = None
     close_window_end: Optional[time] = None
+    # ``time.monotonic()`` at open, when known in this process; preferred for
+    # hold-time checks because it is immune to wall-clock adjustments.
+    opened_monotonic: Optional[float] = None
 
 
+@lru_cache(maxsize=256)
 def parse_time_string(value: str) -> Optional[time]:
+    # Cached: the same handful of "HH:MM" strings are parsed every tick, and
+    # ``time`` results are immutable so sharing them is safe.
     if not value:
         return None
     try:
@@ -367,7 +386,7 @@ def schedule_should_trigger(
 ) -> bool:
     if not schedule.enabled:
         return False
-    if schedule.weekdays and now.weekday() not in schedule.weekdays:
+    if now.weekday() not in schedule.weekdays_set:
         return False
     start_at = parse_time_string(schedule.entry_start)
     end_at = parse_time_string(schedule.entry_end) if schedule.entry_end else None
@@ -385,11 +404,96 @@ def mark_schedule_triggered(state: AutomationState, schedule: ThreadSchedule, wh
     state.last_runs[schedule.thread_id] = when.date().isoformat()
 
 
+def gather_tracked_trades(
+    paired_trades: Mapping[str, Mapping[str, Any]],
+    thread_map: Mapping[Optional[str], ThreadSchedule],
+    now: datetime,
+    legs: Sequence[Any] = (None, None),
+    opened_monotonic: Optional[Mapping[str, float]] = None,
+    opened_dt_cache: Optional[Mapping[str, Tuple[float, Any, datetime]]] = None,
+) -> Tuple[List[TrackedTrade], List[Tuple[Any, str]], Dict[str, float], Dict[str, Tuple[float, Any, datetime]]]:
+    """Build the close-check inputs for the currently open trade pairs.
+
+    Parameters:
+        paired_trades: trade_id -> stored pair record (``account1``/``account2``
+            legs, ``opened_at`` epoch seconds, ``thread_id``).
+        thread_map: thread_id -> schedule supplying each trade's close rules.
+        now: Current timestamp; its tzinfo is used for opened-at datetimes.
+        legs: Opaque handles for leg 1 and leg 2 (the app's workers), paired
+            with each symbol in the returned spread requests.
+        opened_monotonic: trade_id -> ``time.monotonic()`` at open, if known.
+        opened_dt_cache: The cache returned by the previous call. Open times
+            never change, so their aware datetimes are reused while the
+            timestamp and timezone match.
+
+    Returns:
+        ``(trades, spread_requests, profits, opened_dt_cache)`` where profits
+        maps trade_id to the combined running P/L of both legs.
+    """
+    trades: List[TrackedTrade] = []
+    requests: List[Tuple[Any, str]] = []
+    profits: Dict[str, float] = {}
+    previous_dts = opened_dt_cache or {}
+    monotonic_at_open = opened_monotonic or {}
+    opened_dts: Dict[str, Tuple[float, Any, datetime]] = {}
+    leg1, leg2 = legs
+    tzinfo = now.tzinfo
+    add_request = requests.append
+    for trade_id, info in paired_trades.items():
+        opened_ts = float(info.get("opened_at", _time.time()))
+        cached = previous_dts.get(trade_id)
+        if cached is not None and cached[0] == opened_ts and cached[1] is tzinfo:
+            opened_dt = cached[2]
+        else:
+            try:
+                opened_dt = datetime.fromtimestamp(opened_ts, tz=tzinfo)
+            except Exception:
+                opened_dt = datetime.utcfromtimestamp(opened_ts).replace(tzinfo=tzinfo)
+        opened_dts[trade_id] = (opened_ts, tzinfo, opened_dt)
+        symbols: List[str] = []
+        account1 = info.get("account1") or _NO_LEG
+        account2 = info.get("account2") or _NO_LEG
+        sym1 = account1.get("symbol")
+        sym2 = account2.get("symbol")
+        if sym1:
+            symbols.append(sym1)
+            add_request((leg1, sym1))
+        if sym2:
+            symbols.append(sym2)
+            add_request((leg2, sym2))
+        schedule = thread_map.get(info.get("thread_id"))
+        close_after = schedule.close_after_minutes if schedule else 0
+        max_exit = schedule.max_exit_spread if schedule else 0.0
+        close_condition = (schedule.close_condition if schedule else "spread") or "spread"
+        min_profit = float(schedule.min_combined_profit if schedule else 0.0 or 0.0)
+        window_start = parse_time_string(schedule.close_window_start) if schedule else None
+        window_end = parse_time_string(schedule.close_window_end) if schedule else None
+        profit1 = float(account1.get("last_profit", account1.get("profit", 0.0)) or 0.0)
+        profit2 = float(account2.get("last_profit", account2.get("profit", 0.0)) or 0.0)
+        profits[trade_id] = profit1 + profit2
+        trades.append(
+            TrackedTrade(
+                trade_id,
+                opened_dt,
+                tuple(symbols),
+                close_after,
+                max_exit,
+                close_condition,
+                min_profit,
+                window_start,
+                window_end,
+                monotonic_at_open.get(trade_id),
+            )
+        )
+    return trades, requests, profits, opened_dts
+
+
 def trades_due_for_close(
     trades: Iterable[TrackedTrade],
     now: datetime,
-    spreads: Dict[str, float],
+    spreads: Mapping[str, float],
     profits: Dict[str, float],
+    now_monotonic: Optional[float] = None,
 ) -> List[Tuple[str, str]]:
     """Determine which tracked trades are eligible to be closed.
 
@@ -405,6 +509,8 @@ def trades_due_for_close(
         now: Current timestamp used for comparisons.
         spreads: Mapping of symbol to current spread values.
         profits: Mapping of trade ID to the combined profit for that trade.
+        now_monotonic: Current ``time.monotonic()`` reading. When given, trades
+            carrying ``opened_monotonic`` measure their hold time from it.
 
     Returns:
         List[Tuple[str, str]]: ``(trade_id, reason)`` pairs for each eligible
@@ -413,19 +519,22 @@ def trades_due_for_close(
     """
 
     to_close: List[Tuple[str, str]] = []
+    now_time = now.time()
     for trade in trades:
         min_hold_minutes = max(int(trade.close_after_minutes), 0)
-        hold_delta = timedelta(minutes=min_hold_minutes) if min_hold_minutes > 0 else None
-
-        if hold_delta is not None and now - trade.opened_at < hold_delta:
-            continue
+        if min_hold_minutes > 0:
+            if now_monotonic is not None and trade.opened_monotonic is not None:
+                if now_monotonic - trade.opened_monotonic < min_hold_minutes * 60:
+                    continue
+            elif now - trade.opened_at < timedelta(minutes=min_hold_minutes):
+                continue
 
         start_window = trade.close_window_start
         end_window = trade.close_window_end
         window_defined = start_window is not None or end_window is not None
         if window_defined:
             in_window = _time_in_window(
-                now.time(),
+                now_time,
                 start_window,
                 end_window,
             )
@@ -434,13 +543,13 @@ def trades_due_for_close(
                     start_window is not None
                     and end_window is not None
                     and start_window <= end_window
-                    and now.time() > end_window
+                    and now_time > end_window
                 ):
                     to_close.append((trade.trade_id, "time_window_elapsed"))
                 continue
 
         condition = (trade.close_condition or "spread").lower()
-        if condition not in {"spread", "profit", "spread_and_profit"}:
+        if condition not in _CLOSE_CONDITIONS:
             condition = "spread"
 
         spreads_ok = True
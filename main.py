@@ -1,16 +1,21 @@
+import atexit
 import csv
 import os
 import copy
+import itertools
+import queue
 import re
 import sys
-import uuid
 import time
 import threading
-from collections import Counter
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta, date
+from collections import Counter, deque
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from functools import lru_cache, partial
+from datetime import datetime, timedelta, date, timezone, tzinfo
 from pathlib import Path
-from typing import Dict, Any, Optional, Sequence, Union
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Mapping, Optional, Sequence, Union
 from zoneinfo import ZoneInfo
 
 import tkinter as tk
@@ -25,7 +30,9 @@ from automation import (
     RiskConfig,
     ThreadSchedule,
     TrackedTrade,
+    _default_primary_threads,
     drawdown_breached,
+    gather_tracked_trades,
     mark_schedule_triggered,
     parse_time_string,
     schedule_should_trigger,
@@ -39,38 +46,186 @@ DEFAULT_TERMINAL_1 = r"C:\Users\Public\Desktop\XM MT5.lnk"
 DEFAULT_TERMINAL_2 = r"C:\Users\Public\Desktop\Tickmill MT5 Terminal.lnk"
 
 
+def _as_float(value: Any) -> float:
+    """Coerce a stored/persisted figure to float; native floats pass straight through."""
+    if type(value) is float:
+        return value
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# Read-only stand-in for a missing trade leg record.
+_NO_LEG: Mapping[str, Any] = MappingProxyType({})
+_WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+# Bound format methods: the spec is parsed once here rather than per cell.
+_price_fmt = "{:.5f}".format
+_amount_fmt = "{:.2f}".format
+
+
+@lru_cache(maxsize=32)
+def _resolve_timezone(name: str) -> tzinfo:
+    """ZoneInfo for *name*, or aware UTC when the name is unknown."""
+    try:
+        return ZoneInfo(name or "UTC")
+    except Exception:
+        return timezone.utc
+
+
+@lru_cache(maxsize=2048)
+def _fmt_ts_cached(ts: int) -> str:
+    # Entry/close timestamps never change once recorded, so repeats are common.
+    lt = time.localtime(ts)
+    # Fixed numeric layout: field formatting skips strftime's locale machinery.
+    return f"{lt.tm_year:04d}-{lt.tm_mon:02d}-{lt.tm_mday:02d} {lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+
+
+@lru_cache(maxsize=512)
+def _parse_iso_date_cached(value: str) -> Optional[date]:
+    # Screen out non-dates (e.g. "Never") without raising; the try only
+    # covers well-shaped but impossible dates such as 2024-02-30.
+    if not _ISO_DATE_RE.fullmatch(value):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _fmt_ts(ts_value: Any) -> str:
+    """Local-time stamp for a stored epoch value, or "" when unset/invalid."""
+    try:
+        ts = int(float(ts_value))
+    except Exception:
+        return ""
+    if ts <= 0:
+        return ""
+    try:
+        return _fmt_ts_cached(ts)
+    except Exception:
+        return ""
+
+
+class WorkerRpcError(RuntimeError):
+    """Raised when a worker call fails, times out or its pipe is gone."""
+
+
+# Queued by the pipe reader when the worker side goes away.
+_PIPE_CLOSED = object()
+
+
 class WorkerClient:
-    def __init__(self, name: str, terminal_path: str) -> None:
+    def __init__(
+        self,
+        name: str,
+        terminal_path: str,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ) -> None:
         self.name = name
+        # Receives unsolicited worker events (e.g. pushed profits) on the reader thread.
+        self.on_event = on_event
         self.ctx = get_context("spawn")
-        self.req_q = self.ctx.Queue()
-        self.res_q = self.ctx.Queue()
+        # One duplex pipe per worker: no feeder thread or queue semaphore per message.
+        self.conn, child_conn = self.ctx.Pipe(duplex=True)
         self.proc = self.ctx.Process(
             target=worker_main,
-            args=(self.req_q, self.res_q, terminal_path, name),
+            args=(child_conn, terminal_path, name),
             daemon=True,
         )
         self.proc.start()
+        # The child owns its end now; drop our handle so EOF is seen if it dies.
+        child_conn.close()
+        # Guards sends and the pending-reply registry only; replies are awaited unlocked.
         self._lock = threading.Lock()
+        self._id_counter = itertools.count(1)
+        # Set on shutdown so a caller waiting in _rpc gives up promptly.
+        self._cancel = threading.Event()
+        # Order entry points keyed by normalized side, for callers that pick at runtime.
+        self.side_handlers = {"buy": self.buy, "sell": self.sell}
         self._connected = False
+        self._pipe_closed = False
+        # request id -> slot the reader thread drops the matching reply into.
+        self._pending: Dict[int, "queue.SimpleQueue[Any]"] = {}
+        self._reader = threading.Thread(target=self._read_loop, name=f"{name}-reader", daemon=True)
+        self._reader.start()
+
+    def _read_loop(self) -> None:
+        # Sole reader of the pipe: replies go to their caller's slot, events to on_event.
+        while True:
+            try:
+                msg = self.conn.recv()
+            except (OSError, EOFError):
+                self._connected = False
+                with self._lock:
+                    self._pipe_closed = True
+                    slots = list(self._pending.values())
+                    self._pending.clear()
+                for slot in slots:
+                    slot.put(_PIPE_CLOSED)
+                return
+            if "event" in msg:
+                handler = self.on_event
+                if handler is not None:
+                    try:
+                        handler(msg["event"], msg.get("data") or {})
+                    except Exception as exc:
+                        print(f"{self.name} event handler error: {exc}", file=sys.stderr)
+                continue
+            with self._lock:
+                slot = self._pending.pop(msg.get("id"), None)
+            # No slot means the caller already timed out or was cancelled.
+            if slot is not None:
+                slot.put(msg)
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected and not self._cancel.is_set()
 
     def _rpc(self, cmd: str, params: Dict[str, Any], timeout: float = 20.0) -> Dict[str, Any]:
-        request_id = str(uuid.uuid4())
+        request_id = next(self._id_counter)
         payload = {"id": request_id, "cmd": cmd, "params": params}
+        slot: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
 
         with self._lock:
-            self.req_q.put(payload)
-            end_time = time.time() + timeout
+            if self._pipe_closed:
+                raise WorkerRpcError(f"{self.name} worker pipe closed")
+            # Checked under the send lock: once cancel_pending() returns, no new
+            # command (in particular no order) can reach the terminal.
+            if self._cancel.is_set():
+                raise WorkerRpcError(f"{self.name} worker is shutting down")
+            self._pending[request_id] = slot
+            try:
+                self.conn.send(payload)
+            except (OSError, EOFError) as exc:
+                del self._pending[request_id]
+                self._connected = False
+                raise WorkerRpcError(f"{self.name} worker pipe closed: {exc}") from exc
+
+        end_time = time.time() + timeout
+        try:
             while True:
+                if self._cancel.is_set():
+                    raise WorkerRpcError(f"{self.name} worker is shutting down")
                 remaining = max(0.0, end_time - time.time())
                 if remaining == 0.0:
                     raise TimeoutError(f"Timeout waiting for response to {cmd}")
-                res = self.res_q.get(timeout=remaining)
-                if res.get("id") == request_id:
-                    if res.get("status") == "ok":
-                        return res.get("data") or {}
-                    raise RuntimeError(res.get("error") or "Unknown error")
-                # Single outstanding call per worker; ignore mismatched (shouldn't happen)
+                try:
+                    res = slot.get(timeout=min(remaining, 0.25))
+                    break
+                except queue.Empty:
+                    continue
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+        if res is _PIPE_CLOSED:
+            raise WorkerRpcError(f"{self.name} worker pipe closed")
+        if res.get("status") == "ok":
+            return res.get("data") or {}
+        raise WorkerRpcError(res.get("error") or "Unknown error")
 
     def connect(self, path: str) -> Dict[str, Any]:
         data = self._rpc("connect", {"path": path})
@@ -86,9 +241,48 @@ class WorkerClient:
     def get_profit(self, position_ticket: int) -> Dict[str, Any]:
         return self._rpc("get_profit", {"position_ticket": int(position_ticket)})
 
+    def close_batch(self, orders: Sequence[Dict[str, Any]], timeout: float = 20.0) -> list[Dict[str, Any]]:
+        """Close several positions in one round trip.
+
+        Each order takes the same keys as :meth:`close`; the result list holds
+        ``{"ok": True, "data": ...}`` or ``{"ok": False, "error": ...}`` per
+        order, in order.
+        """
+        # Orders are validated worker-side so one bad leg cannot sink the batch;
+        # they run back to back there, so allow each its own time budget.
+        data = self._rpc("close_batch", {"orders": list(orders)}, timeout=timeout * max(1, len(orders)))
+        return data.get("results") or []
+
+    def batch(self, ops: Sequence[tuple[str, Dict[str, Any]]]) -> list[Dict[str, Any]]:
+        """Run several read-only commands in one round trip.
+
+        Returns one ``{status, data, error}`` dict per ``(cmd, params)`` op, in
+        order; a failed op does not raise.
+        """
+        data = self._rpc("batch", {"ops": [{"cmd": cmd, "params": params} for cmd, params in ops]})
+        return data.get("results") or []
+
+    def get_profits(self, position_tickets: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        data = self._rpc("get_profits", {"tickets": [int(t) for t in position_tickets]})
+        return data.get("profits") or {}
+
+    def watch_profits(self, position_tickets: Sequence[int], interval: float = 0.25) -> Dict[str, Any]:
+        """Have the worker push ``profits`` events for these tickets as they change.
+
+        Replaces any previous watch list; an empty list stops the pushes.
+        """
+        return self._rpc(
+            "watch_profits",
+            {"tickets": [int(t) for t in position_tickets], "interval": float(interval)},
+        )
+
     def get_quote(self, symbol: str) -> Dict[str, Any]:
         return self._rpc("get_quote", {"symbol": symbol})
 
+    def get_quotes(self, symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        data = self._rpc("get_quotes", {"symbols": list(symbols)})
+        return data.get("quotes") or {}
+
     def get_account_info(self) -> Dict[str, Any]:
         return self._rpc("get_account_info", {})
 
@@ -104,127 +298,195 @@ class WorkerClient:
             },
         )
 
-    def shutdown(self) -> None:
+    def cancel_pending(self) -> None:
+        """Abort any in-flight RPC; new calls fail until shutdown() runs."""
+        with self._lock:
+            self._cancel.set()
+
+    def shutdown(self, timeout: float = 20.0) -> None:
+        # Fail any waiting callers, then ask the worker to exit and give it
+        # *timeout* seconds to do so before terminating it.
+        self._cancel.set()
         try:
-            self._rpc("shutdown", {})
+            with self._lock:
+                if not self._pipe_closed:
+                    self.conn.send({"id": next(self._id_counter), "cmd": "shutdown", "params": {}})
         except Exception:
             pass
         try:
+            self.proc.join(timeout=timeout)
             if self.proc.is_alive():
                 self.proc.terminate()
+                # Reap it so no zombie outlives the app.
+                self.proc.join(timeout=1.0)
         except Exception:
             pass
 
 
 class ScrollableTable(ttk.Frame):
-    def __init__(self, master: tk.Misc, columns: list[str]) -> None:
+    """Active-trade grid backed by a single ``ttk.Treeview``.
+
+    Rows are Treeview items keyed by ``row_id`` rather than a widget per cell;
+    a toolbar button closes whichever rows are selected.
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        columns: list[str],
+        close_callback: Callable[[list[str]], None],
+        close_label: str = "Close selected",
+    ) -> None:
         super().__init__(master)
-        self.canvas = tk.Canvas(self, borderwidth=0, highlightthickness=0)
-        self.scroll_y = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
-        self.scroll_x = ttk.Scrollbar(self, orient="horizontal", command=self.canvas.xview)
-        self.inner = ttk.Frame(self.canvas)
-
-        self.inner.bind("<Configure>", lambda e: self._update_scrollregion())
-        self._inner_window = self.canvas.create_window((0, 0), window=self.inner, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scroll_y.set, xscrollcommand=self.scroll_x.set)
-        self.canvas.bind("<Shift-MouseWheel>", self._on_shift_mousewheel)
-        self.bind("<Shift-MouseWheel>", self._on_shift_mousewheel)
-        self.inner.bind("<Shift-MouseWheel>", self._on_shift_mousewheel)
-
-        self.canvas.grid(row=0, column=0, sticky="nsew")
-        self.scroll_y.grid(row=0, column=1, sticky="ns")
-        self.scroll_x.grid(row=1, column=0, sticky="ew")
+        self._close_callback = close_callback
+        self._column_ids = [f"c{idx}" for idx in range(len(columns))]
+        self.tree = ttk.Treeview(
+            self,
+            columns=self._column_ids,
+            show="headings",
+            selectmode="extended",
+            height=8,
+        )
+        self.scroll_y = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.scroll_x = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(yscrollcommand=self.scroll_y.set, xscrollcommand=self.scroll_x.set)
+        for column_id, col in zip(self._column_ids, columns):
+            self.tree.heading(column_id, text=col)
+            self.tree.column(column_id, width=140, minwidth=80, stretch=False, anchor="w")
+
+        toolbar = ttk.Frame(self)
+        self.close_button = ttk.Button(toolbar, text=close_label, command=self._close_selected, state="disabled")
+        self.close_button.pack(side="left")
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+
+        toolbar.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 4))
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        self.scroll_y.grid(row=1, column=1, sticky="ns")
+        self.scroll_x.grid(row=2, column=0, sticky="ew")
         self.columnconfigure(0, weight=1)
-        self.rowconfigure(0, weight=1)
-
-        # Header
-        for c, col in enumerate(columns):
-            lbl = ttk.Label(self.inner, text=col, font=("Segoe UI", 9, "bold"))
-            lbl.grid(row=0, column=c, sticky="nsew", padx=4, pady=(2, 6))
-            minsize = 100 if col.lower().startswith("close") else 140
-            self.inner.columnconfigure(c, weight=0, minsize=minsize)
+        self.rowconfigure(1, weight=1)
 
-        self._next_row = 1
         self._rows: Dict[str, Dict[str, Any]] = {}
 
-    def _on_shift_mousewheel(self, event: tk.Event) -> str:
-        delta = getattr(event, "delta", 0)
-        if delta:
-            self.canvas.xview_scroll(int(-1 * (delta / 120)), "units")
-        return "break"
+    def _on_select(self, _event: Any = None) -> None:
+        self.close_button.configure(state="normal" if self.tree.selection() else "disabled")
 
-    def _update_scrollregion(self) -> None:
-        self.canvas.update_idletasks()
-        bbox = self.canvas.bbox("all")
-        if bbox:
-            self.canvas.configure(scrollregion=bbox)
+    def _close_selected(self) -> None:
+        # The whole selection goes out as one request so it closes as one batch.
+        row_ids = [row_id for row_id in self.tree.selection() if row_id in self._rows]
+        if row_ids:
+            self._close_callback(row_ids)
 
     def add_row(
         self,
         row_id: str,
         values: list[Any],
         dynamic_fields: Dict[str, int],
-        close_callback,
     ) -> None:
-        widgets = []
-        dynamic_labels: Dict[str, ttk.Label] = {}
-        index_to_key = {idx: key for key, idx in dynamic_fields.items()}
-
-        # Close button in the first column
-        btn = ttk.Button(self.inner, text="Close", command=lambda: close_callback(row_id))
-        btn.grid(row=self._next_row, column=0, sticky="nsew", padx=4, pady=2)
-        btn.bind("<Shift-MouseWheel>", self._on_shift_mousewheel)
-
-        for c, val in enumerate(values):
-            column_index = c + 1  # shift by one to account for the close button column
-            if c in index_to_key:
-                lbl = ttk.Label(self.inner, text=str(val))
-                lbl.grid(row=self._next_row, column=column_index, sticky="nsew", padx=4, pady=2)
-                lbl.bind("<Shift-MouseWheel>", self._on_shift_mousewheel)
-                dynamic_labels[index_to_key[c]] = lbl
-                widgets.append(lbl)
-            else:
-                w = ttk.Label(self.inner, text=str(val))
-                w.grid(row=self._next_row, column=column_index, sticky="nsew", padx=4, pady=2)
-                w.bind("<Shift-MouseWheel>", self._on_shift_mousewheel)
-                widgets.append(w)
-
+        texts = [str(val) for val in values]
+        if row_id in self._rows:
+            self.tree.item(row_id, values=texts)
+        else:
+            self.tree.insert("", "end", iid=row_id, values=texts)
         self._rows[row_id] = {
-            "widgets": widgets,
-            "dynamic_labels": dynamic_labels,
-            "button": btn,
-            "row_index": self._next_row,
+            "values": texts,
+            "dynamic_fields": dict(dynamic_fields),
         }
-        self._next_row += 1
-        self._update_scrollregion()
 
     def set_metrics(self, row_id: str, metrics: Dict[str, float]) -> None:
         row = self._rows.get(row_id)
         if not row:
             return
-        dynamic_labels: Dict[str, ttk.Label] = row.get("dynamic_labels", {}) or {}
+        fields: Dict[str, int] = row["dynamic_fields"]
+        texts: list[str] = row["values"]
+        changed = False
         for key, value in metrics.items():
-            label = dynamic_labels.get(key)
-            if label is not None:
+            idx = fields.get(key)
+            if idx is not None:
                 try:
-                    label.configure(text=f"{float(value):.2f}")
+                    text = _amount_fmt(float(value))
                 except Exception:
-                    label.configure(text=str(value))
+                    text = str(value)
+                if texts[idx] != text:
+                    texts[idx] = text
+                    changed = True
+        # Quiet markets repeat the same figures; skip the Tk redraw entirely
+        # then, otherwise push one item update per row rather than per cell.
+        if changed:
+            self.tree.item(row_id, values=texts)
 
     def remove_row(self, row_id: str) -> None:
-        row = self._rows.pop(row_id, None)
-        if not row:
+        if self._rows.pop(row_id, None) is None:
             return
-        for w in row.get("widgets", []):
-            w.destroy()
-        for lbl in row.get("dynamic_labels", {}).values():
+        self.tree.delete(row_id)
+        self._on_select()
+
+
+class _StateWriter(threading.Thread):
+    """Writes published automation state to disk off the UI and automation threads.
+
+    The in-memory state is updated immediately so readers never see stale data;
+    disk writes are coalesced and spaced at least ``min_interval`` seconds apart,
+    so a burst of publishes costs a single write. Anything still pending is
+    flushed on stop() or at interpreter exit.
+    """
+
+    def __init__(self, persistence: Persistence, min_interval: float = 5.0) -> None:
+        super().__init__(name="StateWriter", daemon=True)
+        self.persistence = persistence
+        self.min_interval = min_interval
+        self._cond = threading.Condition()
+        self._pending = False
+        self._stopping = False
+        atexit.register(self._flush_at_exit)
+
+    def publish(self, state: AutomationState) -> None:
+        self.persistence.set_state(state)
+        with self._cond:
+            self._pending = True
+            self._cond.notify()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self.is_alive():
+            self.join(timeout=timeout)
+
+    def _flush_at_exit(self) -> None:
+        with self._cond:
+            pending = self._pending
+            self._pending = False
+        if pending:
             try:
-                lbl.destroy()
-            except Exception:
-                pass
-        if row.get("button"):
-            row["button"].destroy()
-        self._update_scrollregion()
+                self.persistence.flush_state()
+            except Exception as exc:
+                print(f"State write error: {exc}", file=sys.stderr)
+
+    def run(self) -> None:
+        last_write = float("-inf")
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopping)
+                # Let further publishes pile up until the interval has passed.
+                while not self._stopping:
+                    remaining = last_write + self.min_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                pending = self._pending
+                self._pending = False
+                stopping = self._stopping
+            if pending:
+                last_write = time.monotonic()
+                try:
+                    self.persistence.flush_state()
+                except Exception as exc:
+                    print(f"State write error: {exc}", file=sys.stderr)
+            if stopping:
+                # The atexit flush stays registered: a publish that lands after
+                # stop() (a runner tick still finishing) is written at exit.
+                break
 
 
 class AutomationRunner:
@@ -233,6 +495,10 @@ class AutomationRunner:
         self.persistence = persistence
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        self._tz_cache: Optional[tuple[str, tzinfo]] = None
+        # (Persistence.state_version, detached copy), refreshed only after a write.
+        # Never mutated itself: each tick works on its own shallow copy.
+        self._state_cache: Optional[tuple[int, AutomationState]] = None
 
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -244,27 +510,57 @@ class AutomationRunner:
     def stop(self) -> None:
         self._stop_event.set()
         if self._thread:
-            self._thread.join(timeout=2.0)
+            # The loop sleeps on _stop_event, so it exits as soon as the current
+            # tick returns; callers cancel worker RPCs first to bound that tick.
+            self._thread.join(timeout=0.5)
+
+    def _current_state(self) -> AutomationState:
+        version = self.persistence.state_version
+        if self._state_cache is None or self._state_cache[0] != version:
+            self._state_cache = (version, self.persistence.get_state())
+        cached = self._state_cache[1]
+        # The tick marks schedules in last_runs and the snapshot swaps in new
+        # lists, so a tick that fails before publishing leaves the cache intact,
+        # and the object handed to on_state_updated is never shared across ticks.
+        return AutomationState(
+            last_runs=dict(cached.last_runs),
+            trade_history=list(cached.trade_history),
+            active_trades=list(cached.active_trades),
+        )
+
+    def _next_delay(self, now: datetime) -> float:
+        # Open trades need per-second close/drawdown checks; otherwise only
+        # minute-resolution entry windows matter, so sleep up to the next
+        # minute boundary (at most 5s).
+        if self.app.paired_trades:
+            return 1.0
+        to_minute = 60.0 - (now.second + now.microsecond / 1_000_000)
+        return max(0.05, min(5.0, to_minute + 0.01))
 
     def _loop(self) -> None:
         while not self._stop_event.is_set():
+            delay = 1.0
             try:
                 config = self.persistence.get_config()
-                state = self.persistence.get_state()
+                state = self._current_state()
                 tz = config.timezone or "UTC"
-                try:
-                    now = datetime.now(ZoneInfo(tz))
-                except Exception:
-                    now = datetime.utcnow()
+                if self._tz_cache is None or self._tz_cache[0] != tz:
+                    self._tz_cache = (tz, _resolve_timezone(tz))
+                    if self._tz_cache[1] is timezone.utc and tz.upper() != "UTC":
+                        self.app._set_automation_status(
+                            f"Unknown timezone '{tz}'; schedules are evaluated in UTC.", ok=False
+                        )
+                now = datetime.now(self._tz_cache[1])
                 changed = self.app.evaluate_automation(now, config, state)
                 if changed:
                     state = self.app.update_state_snapshot(state)
-                    self.persistence.save_state(state)
+                    self.app.publish_state(state)
                     self.app.on_state_updated(state)
+                delay = self._next_delay(now)
             except Exception as exc:
                 print(f"Automation loop error: {exc}", file=sys.stderr)
             finally:
-                if self._stop_event.wait(1.0):
+                if self._stop_event.wait(delay):
                     break
 
 
@@ -282,10 +578,39 @@ class App:
         self.connected1 = False
         self.connected2 = False
         self.trade_counter = 1
+        # Copy-on-write: writers swap in a new dict (and new entry dicts) under
+        # _trade_lock; readers just grab the current reference without locking.
         self.paired_trades: Dict[str, Dict[str, Any]] = {}
         self._trade_lock = threading.Lock()
+        # Per-leg position ticket -> trade_id, swapped copy-on-write alongside
+        # paired_trades so pushed profit updates find their rows directly.
+        self._trades_by_ticket: tuple[Dict[int, str], Dict[int, str]] = ({}, {})
+        self._opened_dt_cache: Dict[str, tuple[float, Any, datetime]] = {}
+        # Closes requested off the UI thread; drained in one batch per Tk callback.
+        self._close_queue: deque[tuple[str, Optional[str]]] = deque()
+        self._close_drain_pending = threading.Event()
+        # time.monotonic() at open for trades opened in this session (not persisted).
+        self._opened_monotonic: Dict[str, float] = {}
+        # (time.monotonic(), account snapshots) shared by the drawdown check and the poller.
+        self._accounts_cache: tuple[float, list[Dict[str, float]]] = (float("-inf"), [])
+        self._profit_poll_stop = threading.Event()
+        # Set when a terminal connects or a trade opens, to end an idle wait early.
+        self._profit_poll_wake = threading.Event()
+        self._profit_poll_thread: Optional[threading.Thread] = None
+        # Profit changes pushed by the workers, as (leg, {ticket: profit}); drained on Tk.
+        self._profit_events: "queue.SimpleQueue[tuple[int, Dict[int, Dict[str, Any]]]]" = queue.SimpleQueue()
+        self._profit_drain_pending = threading.Event()
+        # Tickets each worker was last asked to watch.
+        self._profit_watch: Dict[WorkerClient, frozenset] = {}
+        # Scheduled entries run here so the automation loop never waits on order RPCs.
+        self._dispatch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="TradeDispatch")
+        # Long-lived fan-out pool for paired broker calls (two per pair, plus headroom).
+        self._broker_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="broker")
 
         self.persistence = Persistence(Path("automation_state.json"), Path("automation_config.json"))
+        # Single disk writer for state published by both the UI and the automation loop.
+        self._state_writer = _StateWriter(self.persistence)
+        self._state_writer.start()
         self.config = self.persistence.get_config()
         self.state = self.persistence.get_state()
         self.trade_history: list[Dict[str, Any]] = []
@@ -315,17 +640,27 @@ class App:
 
         self.automation_status_label = None
         self.schedule_tree = None
+        # iid -> values last written to schedule_tree, so refreshes only touch changed rows.
+        self._schedule_row_values: Dict[str, tuple[str, ...]] = {}
+        # Last full row set handed to the UI, compared before scheduling another update.
+        self._schedule_rows_posted: Optional[Dict[str, tuple[str, ...]]] = None
+        self._next_run_cache: Dict[tuple[Any, ...], datetime] = {}
+        self._schedule_refresh_pending = threading.Event()
         self.config_tree = None
         self.trade_history_tree = None
         self._scroll_canvas = None
         self._scrollable_body = None
+        self._summary_config: Optional[AppConfig] = None
+        # (config, weekday -> enabled schedules); rebuilt when the config object changes.
+        self._schedule_index: Optional[tuple[AppConfig, Dict[int, tuple[ThreadSchedule, ...]]]] = None
+        self._thread_map_cache: Optional[tuple[AppConfig, Dict[str, ThreadSchedule]]] = None
 
         self._build_ui()
         self._restore_active_trades()
         self._restore_trade_counter()
         self._refresh_schedule_overview(self.state)
         self._populate_trade_history_tree()
-        self._schedule_profit_updates()
+        self._start_profit_poller()
 
         self.automation_runner.start()
 
@@ -392,9 +727,21 @@ class App:
         scrollable_body = ttk.Frame(canvas)
         scrollable_body_window = canvas.create_window((0, 0), window=scrollable_body, anchor="nw")
 
-        def _update_scrollregion(*_args) -> None:
+        scroll_pending = False
+
+        def _apply_scrollregion() -> None:
+            nonlocal scroll_pending
+            scroll_pending = False
             canvas.configure(scrollregion=canvas.bbox("all"))
 
+        def _update_scrollregion(*_args) -> None:
+            # <Configure> fires for every child resize; walk bbox("all") once per idle pass.
+            nonlocal scroll_pending
+            if scroll_pending:
+                return
+            scroll_pending = True
+            canvas.after_idle(_apply_scrollregion)
+
         scrollable_body.bind("<Configure>", _update_scrollregion)
         canvas.bind(
             "<Configure>",
@@ -462,8 +809,9 @@ class App:
 
         self.table = ScrollableTable(
             active_trades,
+            close_callback=self._close_pairs,
+            close_label="Close selected (both legs)",
             columns=[
-                "Close (both)",
                 "Combined Net Profit",
                 "Trade ID",
                 "Account 1: Pair",
@@ -486,7 +834,7 @@ class App:
             ],
         )
         self.table.grid(row=0, column=0, sticky="nsew")
-        _bind_horizontal_mousewheel(self.table, self.table.canvas.xview_scroll)
+        _bind_horizontal_mousewheel(self.table.tree, self.table.tree.xview_scroll)
 
         drives_frame = ttk.LabelFrame(scrollable_body, text="Active Drives")
         drives_frame.grid(row=1, column=0, sticky="nsew", padx=(0, 6), pady=(0, 12))
@@ -652,7 +1000,7 @@ class App:
         _bind_to_mousewheel(self.trade_history_tree)
         _bind_to_mousewheel(self.schedule_tree)
         _bind_to_mousewheel(self.config_tree)
-        _bind_to_mousewheel(self.table)
+        _bind_to_mousewheel(self.table.tree)
         _ensure_mousewheel_binding()
 
         self._update_config_summary()
@@ -720,10 +1068,11 @@ class App:
             return
         self.config = config
         primary_default = config.primary_threads[0] if config.primary_threads else _default_primary_threads()[0]
-        self.pair1_var.set(primary_default.symbol1)
-        self.lot1_var.set(self._format_number(primary_default.lot1))
-        self.pair2_var.set(primary_default.symbol2)
-        self.lot2_var.set(self._format_number(primary_default.lot2))
+        # Unchanged values are skipped so reloads don't fire traces and redraws for nothing.
+        self._set_if_changed(self.pair1_var, primary_default.symbol1)
+        self._set_if_changed(self.lot1_var, self._format_number(primary_default.lot1))
+        self._set_if_changed(self.pair2_var, primary_default.symbol2)
+        self._set_if_changed(self.lot2_var, self._format_number(primary_default.lot2))
         self._update_config_summary()
         self._refresh_schedule_overview(self.state)
         self._set_automation_status('Configuration reloaded from automation_config.json.', ok=True)
@@ -731,6 +1080,12 @@ class App:
     def _update_config_summary(self) -> None:
         if not self.config_tree:
             return
+        # Persistence hands out one shared AppConfig until the next save, so an
+        # identical object means the summary tree is already current.
+        config = self.config
+        if config is self._summary_config:
+            return
+        self._summary_config = config
 
         def _add_thread(parent, thread) -> None:
             status = 'ENABLED' if thread.enabled else 'Disabled'
@@ -739,7 +1094,7 @@ class App:
             self.config_tree.insert(node, 'end', text='Lots', values=(f"{self._format_number(thread.lot1)} / {self._format_number(thread.lot2)}",))
             self.config_tree.insert(node, 'end', text='Direction', values=(self._direction_key_to_display(thread.direction),))
             self.config_tree.insert(node, 'end', text='Entry Window', values=(self._format_entry_window(thread),))
-            self.config_tree.insert(node, 'end', text='Weekdays', values=(self._format_weekdays(thread.weekdays),))
+            self.config_tree.insert(node, 'end', text='Weekdays', values=(self._format_weekdays(thread.weekdays_set),))
             self.config_tree.insert(node, 'end', text='Max Entry Spread', values=(self._format_number(thread.max_entry_spread),))
             close_after = self._hours_from_minutes(thread.close_after_minutes)
             close_text = f"{close_after} h" if close_after != '0' else 'n/a'
@@ -768,16 +1123,16 @@ class App:
         def _update() -> None:
             tree = self.config_tree
             tree.delete(*tree.get_children())
-            tree.insert('', 'end', text='Timezone', values=(self.config.timezone or 'UTC',))
-            risk_status = 'Enabled' if self.config.risk.drawdown_enabled else 'Disabled'
+            tree.insert('', 'end', text='Timezone', values=(config.timezone or 'UTC',))
+            risk_status = 'Enabled' if config.risk.drawdown_enabled else 'Disabled'
             risk_node = tree.insert('', 'end', text='Risk Controls', values=(risk_status,), open=True)
-            if self.config.risk.drawdown_enabled:
-                tree.insert(risk_node, 'end', text='Drawdown Stop (%)', values=(self._format_number(self.config.risk.drawdown_stop),))
+            if config.risk.drawdown_enabled:
+                tree.insert(risk_node, 'end', text='Drawdown Stop (%)', values=(self._format_number(config.risk.drawdown_stop),))
             primary_root = tree.insert('', 'end', text='Primary Threads', values=('',), open=True)
-            for thread in self.config.primary_threads:
+            for thread in config.primary_threads:
                 _add_thread(primary_root, thread)
             wednesday_root = tree.insert('', 'end', text='Wednesday Threads', values=('',), open=True)
-            for thread in self.config.wednesday_threads:
+            for thread in config.wednesday_threads:
                 _add_thread(wednesday_root, thread)
 
         self._invoke_on_ui(_update)
@@ -869,28 +1224,32 @@ class App:
         entry["account1"] = account1
         entry["account2"] = account2
 
+        # Both legs usually fill in the same second; format that timestamp once.
+        time1 = self._fmt_time(entry_time1)
+        time2 = time1 if entry_time2 == entry_time1 else self._fmt_time(entry_time2)
+
         self.table.add_row(
             trade_id,
             [
-                f"{combined_profit:.2f}",
+                _amount_fmt(combined_profit),
                 trade_id,
                 symbol1,
                 lot1,
-                f"{price1:.5f}" if isinstance(price1, float) else "",
-                self._fmt_time(entry_time1),
-                f"{commission1:.2f}",
-                f"{swap1:.2f}",
-                f"{profit1:.2f}",
+                _price_fmt(price1) if price1 is not None else "",
+                time1,
+                _amount_fmt(commission1),
+                _amount_fmt(swap1),
+                _amount_fmt(profit1),
                 symbol2,
                 lot2,
-                f"{price2:.5f}" if isinstance(price2, float) else "",
-                self._fmt_time(entry_time2),
-                f"{commission2:.2f}",
-                f"{swap2:.2f}",
-                f"{profit2:.2f}",
+                _price_fmt(price2) if price2 is not None else "",
+                time2,
+                _amount_fmt(commission2),
+                _amount_fmt(swap2),
+                _amount_fmt(profit2),
                 side_label,
-                f"{combined_commission:.2f}",
-                f"{combined_swap:.2f}",
+                _amount_fmt(combined_commission),
+                _amount_fmt(combined_swap),
             ],
             dynamic_fields={
                 "combined_profit": 0,
@@ -903,31 +1262,14 @@ class App:
                 "combined_commission": 17,
                 "combined_swap": 18,
             },
-            close_callback=self._on_close_pair,
-        )
-
-        self.table.set_metrics(
-            trade_id,
-            {
-                "p1_commission": commission1,
-                "p1_swap": swap1,
-                "p1_profit": profit1,
-                "p2_commission": commission2,
-                "p2_swap": swap2,
-                "p2_profit": profit2,
-                "combined_commission": combined_commission,
-                "combined_swap": combined_swap,
-                "combined_profit": combined_profit,
-            },
         )
 
     def _snapshot_active_trades(self) -> list[Dict[str, Any]]:
         snapshot: list[Dict[str, Any]] = []
-        with self._trade_lock:
-            for trade_id, info in self.paired_trades.items():
-                entry = {"trade_id": str(trade_id)}
-                entry.update(copy.deepcopy(info))
-                snapshot.append(entry)
+        for trade_id, info in self.paired_trades.items():
+            entry = {"trade_id": str(trade_id)}
+            entry.update(copy.deepcopy(info))
+            snapshot.append(entry)
         return snapshot
 
     def _update_state_snapshot(self, state: Optional[AutomationState] = None) -> AutomationState:
@@ -948,8 +1290,11 @@ class App:
         return self._update_state_snapshot(state)
 
     def _save_state(self) -> None:
-        state = self._update_state_snapshot()
-        self.persistence.save_state(state)
+        self.publish_state(self._update_state_snapshot())
+
+    def publish_state(self, state: AutomationState) -> None:
+        """Make *state* current in memory now; the state writer persists it."""
+        self._state_writer.publish(state)
 
     def _restore_active_trades(self) -> None:
         active = getattr(self.state, "active_trades", [])
@@ -964,8 +1309,7 @@ class App:
             if not trade_id:
                 continue
             info = {k: copy.deepcopy(v) for k, v in raw.items() if k != "trade_id"}
-            with self._trade_lock:
-                self.paired_trades[trade_id] = info
+            self._publish_trade(trade_id, info)
             self._add_trade_to_table(trade_id, info)
             restored += 1
 
@@ -1004,9 +1348,14 @@ class App:
             return 0
 
     def _record_trade_history(self, entry: Dict[str, Any]) -> None:
-        cleaned = dict(entry)
-        cleaned.setdefault('recorded_at', time.time())
-        self.trade_history.append(cleaned)
+        self._record_trade_histories([entry])
+
+    def _record_trade_histories(self, entries: Sequence[Dict[str, Any]]) -> None:
+        # Persist, redraw and export once for the whole batch.
+        for entry in entries:
+            cleaned = dict(entry)
+            cleaned.setdefault('recorded_at', time.time())
+            self.trade_history.append(cleaned)
         if len(self.trade_history) > self.trade_history_limit:
             self.trade_history = self.trade_history[-self.trade_history_limit:]
         self._save_state()
@@ -1042,19 +1391,6 @@ class App:
             "combined_swap",
         ]
 
-        def _fmt_ts(ts_value: Any) -> str:
-            try:
-                ts_float = float(ts_value)
-            except Exception:
-                return ""
-            if ts_float <= 0:
-                return ""
-            try:
-                dt = datetime.fromtimestamp(ts_float)
-                return dt.strftime("%Y-%m-%d %H:%M:%S")
-            except Exception:
-                return ""
-
         rows: list[Dict[str, Any]] = []
         for entry in self.trade_history:
             if not isinstance(entry, dict):
@@ -1102,34 +1438,78 @@ class App:
         except Exception as exc:
             print(f"Failed to export trade history CSV: {exc}", file=sys.stderr)
 
-    def _update_trade_profit_cache(
-        self,
-        trade_id: str,
-        profit1: float,
-        commission1: float,
-        swap1: float,
-        profit2: float,
-        commission2: float,
-        swap2: float,
-    ) -> None:
+    def _publish_trade(self, trade_id: str, entry: Dict[str, Any]) -> None:
+        """Insert or replace a trade; *entry* must not be mutated afterwards."""
+        ticket1 = self._leg_snapshot(entry.get("account1") or _NO_LEG)[0]
+        ticket2 = self._leg_snapshot(entry.get("account2") or _NO_LEG)[0]
         with self._trade_lock:
-            info = self.paired_trades.get(trade_id)
-            if not info:
-                return
-            if isinstance(info.get('account1'), dict):
-                account1 = info['account1']
-                account1['last_profit'] = float(profit1)
-                account1['last_commission'] = float(commission1)
-                account1['last_swap'] = float(swap1)
-                account1['commission'] = float(commission1)
-                account1['swap'] = float(swap1)
-            if isinstance(info.get('account2'), dict):
-                account2 = info['account2']
-                account2['last_profit'] = float(profit2)
-                account2['last_commission'] = float(commission2)
-                account2['last_swap'] = float(swap2)
-                account2['commission'] = float(commission2)
-                account2['swap'] = float(swap2)
+            trades = dict(self.paired_trades)
+            trades[trade_id] = entry
+            self.paired_trades = trades
+            indexes = []
+            for index, ticket in zip(self._trades_by_ticket, (ticket1, ticket2)):
+                # Drop any ticket this trade held before (a republish may change it).
+                index = {t: tid for t, tid in index.items() if tid != trade_id}
+                if ticket:
+                    index[ticket] = trade_id
+                indexes.append(index)
+            self._trades_by_ticket = (indexes[0], indexes[1])
+        self._profit_poll_wake.set()
+
+    def _discard_trade(self, trade_id: str) -> Optional[Dict[str, Any]]:
+        return self._discard_trades([trade_id]).get(trade_id)
+
+    def _discard_trades(self, trade_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Remove several trades with one copy-on-write swap; returns those removed."""
+        with self._trade_lock:
+            gone = [tid for tid in trade_ids if tid in self.paired_trades]
+            if not gone:
+                return {}
+            trades = dict(self.paired_trades)
+            removed = {tid: trades.pop(tid) for tid in gone}
+            self.paired_trades = trades
+            self._trades_by_ticket = tuple(
+                {ticket: tid for ticket, tid in index.items() if tid not in removed}
+                for index in self._trades_by_ticket
+            )
+        for tid in removed:
+            self._opened_monotonic.pop(tid, None)
+        return removed
+
+    @staticmethod
+    def _leg_with_profit(leg: Dict[str, Any], profit: float, commission: float, swap: float) -> Dict[str, Any]:
+        return {
+            **leg,
+            'last_profit': profit,
+            'last_commission': commission,
+            'last_swap': swap,
+            'commission': commission,
+            'swap': swap,
+        }
+
+    def _update_trade_profit_caches(self, rows: Sequence[tuple[str, Dict[str, float], bool]]) -> None:
+        """Store each row's latest figures on its trade; one dict swap for the batch."""
+        with self._trade_lock:
+            current = self.paired_trades
+            trades: Optional[Dict[str, Dict[str, Any]]] = None
+            for trade_id, metrics, _closed in rows:
+                info = current.get(trade_id)
+                if not info:
+                    continue
+                updated = dict(info)
+                if isinstance(info.get('account1'), dict):
+                    updated['account1'] = self._leg_with_profit(
+                        info['account1'], metrics["p1_profit"], metrics["p1_commission"], metrics["p1_swap"]
+                    )
+                if isinstance(info.get('account2'), dict):
+                    updated['account2'] = self._leg_with_profit(
+                        info['account2'], metrics["p2_profit"], metrics["p2_commission"], metrics["p2_swap"]
+                    )
+                if trades is None:
+                    trades = dict(current)
+                trades[trade_id] = updated
+            if trades is not None:
+                self.paired_trades = trades
 
     @staticmethod
     def _direction_key_to_display(key: str) -> str:
@@ -1145,10 +1525,9 @@ class App:
     def _hours_from_minutes(minutes: int) -> str:
         if minutes <= 0:
             return "0"
-        hours = minutes / 60.0
-        if abs(hours - round(hours)) < 1e-6:
-            return str(int(round(hours)))
-        return f"{hours:.2f}"
+        if minutes % 60 == 0:
+            return str(int(minutes) // 60)
+        return f"{minutes / 60.0:.2f}"
 
     @staticmethod
     def _minutes_from_hours(value: str) -> int:
@@ -1160,10 +1539,20 @@ class App:
 
     @staticmethod
     def _format_number(value: float) -> str:
+        # Whole numbers (the common case for lots/spreads/hours) skip the strip pass.
+        if type(value) is int:
+            return str(value)
+        if type(value) is float and value.is_integer():
+            return str(int(value))
         text = f"{value:.4f}"
         text = text.rstrip("0").rstrip(".")
         return text or "0"
 
+    @staticmethod
+    def _set_if_changed(var: tk.Variable, value: Any) -> None:
+        if var.get() != value:
+            var.set(value)
+
     @staticmethod
     def _format_money(value: Any) -> str:
         try:
@@ -1178,19 +1567,38 @@ class App:
             state = getattr(self, 'state', None)
             if state is None:
                 state = self.persistence.get_state()
-        tz_name = self.config.timezone or "UTC"
-        try:
-            tz = ZoneInfo(tz_name)
-        except Exception:
-            tz = ZoneInfo("UTC")
-        now = datetime.now(tz)
+        now = datetime.now(_resolve_timezone(self.config.timezone or "UTC"))
         schedules = [*self.config.primary_threads, *self.config.wednesday_threads]
-        rows = [self._schedule_overview_row(schedule, state, now) for schedule in schedules]
+        # Rows are keyed by thread_id (suffixed if a config repeats one) so the
+        # tree can be patched in place instead of cleared and refilled.
+        rows: Dict[str, tuple[str, ...]] = {}
+        for schedule in schedules:
+            iid = schedule.thread_id
+            if iid in rows:
+                iid = f"{iid}#{len(rows)}"
+            rows[iid] = self._schedule_overview_row(schedule, state, now)
+        if rows == self._schedule_rows_posted:
+            # Nothing visible changed since the last refresh; skip the Tk callback.
+            return
+        self._schedule_rows_posted = rows
 
         def _update_tree() -> None:
-            self.schedule_tree.delete(*self.schedule_tree.get_children())
-            for values in rows:
-                self.schedule_tree.insert("", "end", values=values)
+            tree = self.schedule_tree
+            shown = self._schedule_row_values
+            for iid in [iid for iid in shown if iid not in rows]:
+                tree.delete(iid)
+                del shown[iid]
+            for index, (iid, values) in enumerate(rows.items()):
+                if iid not in shown:
+                    tree.insert("", index, iid=iid, values=values)
+                elif shown[iid] != values:
+                    tree.item(iid, values=values)
+                shown[iid] = values
+            if list(shown) != list(rows):
+                # Config reordered its threads; move the existing items to match.
+                for index, iid in enumerate(rows):
+                    tree.move(iid, "", index)
+                self._schedule_row_values = {iid: shown[iid] for iid in rows}
 
         self._invoke_on_ui(_update_tree)
 
@@ -1205,7 +1613,22 @@ class App:
                 incoming_history = incoming_history[-self.trade_history_limit:]
             self.trade_history = incoming_history
             self._populate_trade_history_tree()
-        self._refresh_schedule_overview(state)
+        self._request_schedule_refresh()
+
+    def _request_schedule_refresh(self) -> None:
+        """Refresh the schedule overview within 500 ms, folding bursts into one pass."""
+        if self._schedule_refresh_pending.is_set():
+            return
+        self._schedule_refresh_pending.set()
+        try:
+            self.root.after(500, self._run_schedule_refresh)
+        except Exception:
+            self._schedule_refresh_pending.clear()
+
+    def _run_schedule_refresh(self) -> None:
+        self._schedule_refresh_pending.clear()
+        # self.state is the latest snapshot handed to on_state_updated.
+        self._refresh_schedule_overview(self.state)
 
     def _schedule_overview_row(
         self, schedule: ThreadSchedule, state: AutomationState, now: datetime
@@ -1216,11 +1639,28 @@ class App:
         direction = self._direction_key_to_display(schedule.direction)
         window = self._format_entry_window(schedule)
         close_rule = self._format_close_rule(schedule)
-        days = self._format_weekdays(schedule.weekdays)
+        days = self._format_weekdays(schedule.weekdays_set)
         last_run_iso = state.last_runs.get(schedule.thread_id)
         last_run_date = self._parse_iso_date(last_run_iso)
-        last_run_display = last_run_date.strftime("%Y-%m-%d") if last_run_date else "Never"
-        next_run_dt = self._next_schedule_time(schedule, now, last_run_date)
+        last_run_display = last_run_date.isoformat() if last_run_date else "Never"
+        # A future start time stays the answer until the clock reaches it, as long
+        # as the schedule and its last run are unchanged.
+        cache_key = (
+            schedule.thread_id,
+            schedule.enabled,
+            schedule.entry_start,
+            schedule.entry_end,
+            schedule.weekdays_set,
+            last_run_date,
+            now.tzinfo,
+        )
+        next_run_dt = self._next_run_cache.get(cache_key)
+        if next_run_dt is None or now >= next_run_dt:
+            next_run_dt = self._next_schedule_time(schedule, now, last_run_date)
+            if isinstance(next_run_dt, datetime) and next_run_dt > now:
+                if len(self._next_run_cache) > 256:
+                    self._next_run_cache.clear()
+                self._next_run_cache[cache_key] = next_run_dt
         if isinstance(next_run_dt, datetime):
             if abs((next_run_dt - now).total_seconds()) < 1:
                 next_run_display = "Window active"
@@ -1310,28 +1750,23 @@ class App:
         return mapping.get(key, text)
 
     @staticmethod
-    def _format_weekdays(weekdays: Sequence[int]) -> str:
-        if not weekdays:
+    def _format_weekdays(weekdays: frozenset) -> str:
+        """Label for a schedule's ``weekdays_set`` (already normalised to 0-6)."""
+        if len(weekdays) >= 7:
             return "All days"
-        names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        try:
-            ordered = sorted({int(day) % 7 for day in weekdays})
-        except Exception:
-            return "All days"
-        return ", ".join(names[day] for day in ordered)
+        return ", ".join(_WEEKDAY_NAMES[day] for day in sorted(weekdays))
 
     @staticmethod
     def _parse_iso_date(value: Optional[str]) -> Optional[date]:
-        if not value:
-            return None
-        try:
-            return date.fromisoformat(value)
-        except Exception:
+        # Anything but a non-empty string (None, numbers from a hand-edited
+        # state file) is "never run"; it must not reach the cache or the regex.
+        if not value or not isinstance(value, str):
             return None
+        return _parse_iso_date_cached(value)
 
     @staticmethod
     def _format_datetime(dt: datetime) -> str:
-        return dt.strftime("%Y-%m-%d %H:%M")
+        return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
 
     def _next_schedule_time(
         self, schedule: ThreadSchedule, now: datetime, last_run: Optional[date]
@@ -1342,19 +1777,24 @@ class App:
         if start_time is None:
             return "Set entry time"
         end_time = parse_time_string(schedule.entry_end) if schedule.entry_end else None
-        weekdays = list(schedule.weekdays) if schedule.weekdays else list(range(7))
-
-        for offset in range(14):
-            candidate_date = now.date() + timedelta(days=offset)
-            if weekdays and candidate_date.weekday() not in weekdays:
-                continue
-            start_dt = datetime.combine(candidate_date, start_time, tzinfo=now.tzinfo)
-            end_dt = None
-            if end_time:
-                end_dt = datetime.combine(candidate_date, end_time, tzinfo=now.tzinfo)
-                if end_time <= start_time:
-                    end_dt += timedelta(days=1)
+        # Only day offsets landing on an allowed weekday can match; list them
+        # directly (this week and next) instead of scanning all 14 days.
+        today = now.date()
+        weekday = today.weekday()
+        offsets = sorted((day - weekday) % 7 for day in schedule.weekdays_set)
+        offsets += [offset + 7 for offset in offsets]
+        tz = now.tzinfo
+        # Overnight windows end on the following day.
+        end_offset_days = 1 if end_time and end_time <= start_time else 0
+
+        for offset in offsets:
+            candidate_date = today + timedelta(days=offset)
+            start_dt = datetime.combine(candidate_date, start_time, tzinfo=tz)
             if offset == 0:
+                # The end of the window only matters for today's candidate.
+                end_dt = None
+                if end_time:
+                    end_dt = datetime.combine(today + timedelta(days=end_offset_days), end_time, tzinfo=tz)
                 if last_run and last_run == candidate_date:
                     if end_dt and now <= end_dt:
                         continue
@@ -1402,36 +1842,59 @@ class App:
             except Exception:
                 pass
 
-    def _execute_schedule_trade(self, schedule: ThreadSchedule) -> None:
+    def _execute_schedule_trade(self, schedule: ThreadSchedule, symbol1: str, symbol2: str) -> str:
         sides = self._direction_key_to_sides(schedule.direction)
+        return self._open_trade_pair(
+            symbol1,
+            float(schedule.lot1),
+            sides[0],
+            symbol2,
+            float(schedule.lot2),
+            sides[1],
+            schedule_name=schedule.name,
+            schedule_thread_id=schedule.thread_id,
+        )
+
+    def _submit_schedule_trade(self, schedule: ThreadSchedule) -> None:
+        if schedule.symbol1 and schedule.symbol2:
+            self._dispatch_schedule_trade(schedule, schedule.symbol1, schedule.symbol2)
+            return
+        # Blank symbols fall back to the order form, whose Tk variables may only
+        # be read on the UI thread; resolve them there before dispatching.
+        self._invoke_on_ui(partial(self._dispatch_schedule_trade_from_form, schedule))
+
+    def _dispatch_schedule_trade_from_form(self, schedule: ThreadSchedule) -> None:
+        symbol1 = schedule.symbol1 or self.pair1_var.get().strip()
+        symbol2 = schedule.symbol2 or self.pair2_var.get().strip()
+        self._dispatch_schedule_trade(schedule, symbol1, symbol2)
+
+    def _dispatch_schedule_trade(self, schedule: ThreadSchedule, symbol1: str, symbol2: str) -> None:
         try:
-            symbol1 = schedule.symbol1 or self.pair1_var.get().strip()
-            symbol2 = schedule.symbol2 or self.pair2_var.get().strip()
-            lot1 = float(schedule.lot1)
-            lot2 = float(schedule.lot2)
-            self._open_trade_pair(
-                symbol1,
-                lot1,
-                sides[0],
-                symbol2,
-                lot2,
-                sides[1],
-                schedule_name=schedule.name,
-                schedule_thread_id=schedule.thread_id,
-            )
-            self._set_automation_status(
-                f"Scheduled trade executed for {schedule.name} ({schedule.thread_id}).",
-                ok=True,
-            )
-        except Exception as exc:
+            future = self._dispatch_pool.submit(self._execute_schedule_trade, schedule, symbol1, symbol2)
+        except RuntimeError:
+            # Pool already shut down: the app is closing.
+            return
+        future.add_done_callback(partial(self._on_schedule_trade_done, schedule))
+
+    def _on_schedule_trade_done(self, schedule: ThreadSchedule, future: Future) -> None:
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
             self._set_automation_status(f"Failed to execute {schedule.name}: {exc}", ok=False)
+            return
+        self._set_automation_status(
+            f"Scheduled trade executed for {schedule.name} ({schedule.thread_id}).",
+            ok=True,
+        )
 
     @staticmethod
     def _fmt_time(ts: int) -> str:
         if not ts:
             return ""
         try:
-            return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(int(ts)))
+            # Callers mostly pass ints already; skip the conversion for them.
+            return _fmt_ts_cached(ts if type(ts) is int else int(ts))
         except Exception:
             return str(ts)
 
@@ -1452,29 +1915,32 @@ class App:
             raise ValueError("Symbols required")
         if lot1 <= 0 or lot2 <= 0:
             raise ValueError("Lot sizes must be positive")
+        side1 = side1.lower()
+        side2 = side2.lower()
+        if side1 not in self.worker1.side_handlers or side2 not in self.worker2.side_handlers:
+            raise ValueError(f"Unknown trade side: {side1!r}/{side2!r}")
 
-        trade_id = f"T{self.trade_counter:05d}"
-        self.trade_counter += 1
+        with self._trade_lock:
+            trade_id = f"T{self.trade_counter:05d}"
+            self.trade_counter += 1
         magic1 = self.MAGIC_BASE + 1
         magic2 = self.MAGIC_BASE + 2
 
-        with ThreadPoolExecutor(max_workers=2) as ex:
-            f1 = ex.submit(
-                self.worker1.buy if side1.lower() == "buy" else self.worker1.sell,
-                symbol1,
-                float(lot1),
-                trade_id,
-                magic1,
-            )
-            f2 = ex.submit(
-                self.worker2.buy if side2.lower() == "buy" else self.worker2.sell,
-                symbol2,
-                float(lot2),
-                trade_id,
-                magic2,
-            )
-            r1 = f1.result(timeout=20)
-            r2 = f2.result(timeout=20)
+        f1 = self._broker_pool.submit(
+            self.worker1.side_handlers[side1],
+            symbol1,
+            float(lot1),
+            trade_id,
+            magic1,
+        )
+        f2 = self._broker_pool.submit(
+            self.worker2.side_handlers[side2],
+            symbol2,
+            float(lot2),
+            trade_id,
+            magic2,
+        )
+        r1, r2 = self._await_pair(f1, f2, timeout=20)
 
         pos1 = int(r1.get("position_ticket", 0))
         pos2 = int(r2.get("position_ticket", 0))
@@ -1488,9 +1954,7 @@ class App:
             "thread_id": schedule_thread_id,
             "opened_at": time.time(),
         }
-        with self._trade_lock:
-            self.paired_trades[trade_id] = entry
-
+        self._opened_monotonic[trade_id] = time.monotonic()
         eprice1 = r1.get("entry_price")
         eprice2 = r2.get("entry_price")
         etime1 = r1.get("entry_time") or 0
@@ -1514,24 +1978,68 @@ class App:
         entry["account2"]["last_commission"] = commission2
         entry["account1"]["last_swap"] = swap1
         entry["account2"]["last_swap"] = swap2
+        self._publish_trade(trade_id, entry)
 
-        self._add_trade_to_table(trade_id, entry)
-        self._save_state()
+        # May run on the dispatch thread; widgets and self.state are only touched
+        # from the UI loop.
+        self._invoke_on_ui(lambda: self._add_trade_to_table(trade_id, entry))
+        self._invoke_on_ui(self._save_state)
         return trade_id
 
-    def _fetch_spreads(self, requests: Sequence[tuple[Optional[WorkerClient], str]]) -> Dict[str, float]:
+    @staticmethod
+    def _fetch_worker_spreads(worker: WorkerClient, symbols: Sequence[str]) -> Dict[str, float]:
+        # One get_quotes round-trip per worker; symbols the terminal can't quote are omitted.
         spreads: Dict[str, float] = {}
-        seen: set[str] = set()
+        if not worker.is_connected:
+            return spreads
+        try:
+            quotes = worker.get_quotes(symbols)
+        except (WorkerRpcError, TimeoutError):
+            return spreads
+        for symbol, quote in quotes.items():
+            spreads[symbol] = quote.get("spread", 0.0)
+        return spreads
+
+    def _fetch_spreads(
+        self,
+        requests: Sequence[tuple[Optional[WorkerClient], str]],
+        quote_cache: Optional[Dict[tuple[WorkerClient, str], float]] = None,
+    ) -> Dict[str, float]:
+        """Quote each symbol once; *quote_cache* carries spreads across calls."""
+        if quote_cache is None:
+            quote_cache = {}
+        # Group by terminal so each worker's quotes run concurrently with the other's.
+        groups: Dict[WorkerClient, list[str]] = {}
+        candidates: Dict[str, list[WorkerClient]] = {}
         for worker, symbol in requests:
             symbol = (symbol or "").strip()
-            if not symbol or symbol in seen or worker is None:
+            if not symbol or worker is None:
                 continue
+            symbols = groups.setdefault(worker, [])
+            if symbol not in symbols:
+                symbols.append(symbol)
+                candidates.setdefault(symbol, []).append(worker)
+        futures = {}
+        for worker, symbols in groups.items():
+            missing = [sym for sym in symbols if (worker, sym) not in quote_cache]
+            if missing:
+                futures[worker] = self._broker_pool.submit(self._fetch_worker_spreads, worker, missing)
+        for worker, future in futures.items():
             try:
-                quote = worker.get_quote(symbol)
-                spreads[symbol] = float(quote.get("spread", 0.0))
-                seen.add(symbol)
+                fetched = future.result(timeout=25)
             except Exception:
                 continue
+            for symbol, spread in fetched.items():
+                quote_cache[(worker, symbol)] = spread
+
+        # First successful quote per symbol wins, in request order.
+        spreads: Dict[str, float] = {}
+        for symbol, workers in candidates.items():
+            for worker in workers:
+                spread = quote_cache.get((worker, symbol))
+                if spread is not None:
+                    spreads[symbol] = spread
+                    break
         return spreads
 
     def _gather_active_trades(
@@ -1543,110 +2051,154 @@ class App:
         list[tuple[Optional[WorkerClient], str]],
         Dict[str, float],
     ]:
-        trades: list[TrackedTrade] = []
-        requests: list[tuple[Optional[WorkerClient], str]] = []
-        profits: Dict[str, float] = {}
-        thread_map: Dict[str, ThreadSchedule] = {
-            thread.thread_id: thread
-            for thread in (*config.primary_threads, *config.wednesday_threads)
-        }
-        with self._trade_lock:
-            for trade_id, info in self.paired_trades.items():
-                opened_ts = float(info.get("opened_at", time.time()))
-                try:
-                    opened_dt = datetime.fromtimestamp(opened_ts, tz=now.tzinfo)
-                except Exception:
-                    opened_dt = datetime.utcfromtimestamp(opened_ts).replace(tzinfo=now.tzinfo)
-                symbols: list[str] = []
-                account1 = info.get("account1", {})
-                account2 = info.get("account2", {})
-                sym1 = account1.get("symbol")
-                sym2 = account2.get("symbol")
-                if sym1:
-                    symbols.append(sym1)
-                    requests.append((self.worker1, sym1))
-                if sym2:
-                    symbols.append(sym2)
-                    requests.append((self.worker2, sym2))
-                thread_id = info.get("thread_id")
-                schedule = thread_map.get(thread_id)
-                close_after = schedule.close_after_minutes if schedule else 0
-                max_exit = schedule.max_exit_spread if schedule else 0.0
-                close_condition = (schedule.close_condition if schedule else "spread") or "spread"
-                min_profit = float(schedule.min_combined_profit if schedule else 0.0 or 0.0)
-                window_start = parse_time_string(schedule.close_window_start) if schedule else None
-                window_end = parse_time_string(schedule.close_window_end) if schedule else None
-                profit1 = float(account1.get("last_profit", account1.get("profit", 0.0)) or 0.0)
-                profit2 = float(account2.get("last_profit", account2.get("profit", 0.0)) or 0.0)
-                profits[trade_id] = profit1 + profit2
-                trades.append(
-                    TrackedTrade(
-                        trade_id,
-                        opened_dt,
-                        tuple(symbols),
-                        close_after,
-                        max_exit,
-                        close_condition,
-                        min_profit,
-                        window_start,
-                        window_end,
-                    )
-                )
+        trades, requests, profits, self._opened_dt_cache = gather_tracked_trades(
+            self.paired_trades,
+            self._thread_map_for(config),
+            now,
+            legs=(self.worker1, self.worker2),
+            opened_monotonic=self._opened_monotonic,
+            opened_dt_cache=self._opened_dt_cache,
+        )
         return trades, requests, profits
 
     def _close_pair_threadsafe(self, trade_id: str, reason: Optional[str] = None) -> None:
-        self._invoke_on_ui(lambda tid=trade_id, why=reason: self._on_close_pair(tid, why))
+        self._close_queue.append((trade_id, reason))
+        if not self._close_drain_pending.is_set():
+            self._close_drain_pending.set()
+            self._invoke_on_ui(self._drain_close_queue)
+
+    def _drain_close_queue(self) -> None:
+        # Clear first: anything queued after this point schedules a fresh drain.
+        self._close_drain_pending.clear()
+        by_reason: Dict[Optional[str], list[str]] = {}
+        while self._close_queue:
+            trade_id, reason = self._close_queue.popleft()
+            ids = by_reason.setdefault(reason, [])
+            if trade_id not in ids:
+                ids.append(trade_id)
+        for reason, trade_ids in by_reason.items():
+            self._close_pairs(trade_ids, reason)
 
     def _close_all_pairs_threadsafe(self, reason: Optional[str] = None) -> None:
-        self._invoke_on_ui(lambda why=reason: self._close_all_pairs(why))
+        self._invoke_on_ui(partial(self._close_all_pairs, reason))
 
     def _close_all_pairs(self, reason: Optional[str] = None) -> None:
-        with self._trade_lock:
-            trade_ids = list(self.paired_trades.keys())
-        for trade_id in trade_ids:
-            self._on_close_pair(trade_id, reason)
-
-    def _fetch_accounts(self) -> list[Dict[str, float]]:
-        accounts: list[Dict[str, float]] = []
-        for worker in (self.worker1, self.worker2):
-            if worker is None:
+        self._close_pairs(list(self.paired_trades), reason)
+
+    def _fan_out(self, calls: Sequence[Optional[Callable[[], Any]]], timeout: float = 20.0) -> list[Any]:
+        """Run independent broker calls concurrently; skipped or failed calls yield None."""
+        return self._collect(self._submit_calls(calls), timeout)
+
+    @staticmethod
+    def _await_pair(f1: Future, f2: Future, timeout: float) -> tuple[Any, Any]:
+        """Return both leg results, raising as soon as either leg fails.
+
+        Waiting on the pair rather than on each future in turn means a failure
+        on leg 2 surfaces immediately instead of after leg 1's full timeout.
+        """
+        done, not_done = wait((f1, f2), timeout=timeout, return_when=FIRST_EXCEPTION)
+        for future in done:
+            error = future.exception()
+            if error is not None:
+                raise error
+        if not_done:
+            raise FuturesTimeoutError(f"Leg did not complete within {timeout:g}s")
+        return f1.result(), f2.result()
+
+    def _submit_calls(self, calls: Sequence[Optional[Callable[[], Any]]]) -> list[Optional[Future]]:
+        return [self._broker_pool.submit(call) if call is not None else None for call in calls]
+
+    @staticmethod
+    def _collect(futures: Sequence[Optional[Future]], timeout: float = 20.0) -> list[Any]:
+        results: list[Any] = []
+        for future in futures:
+            if future is None:
+                results.append(None)
                 continue
             try:
-                accounts.append(worker.get_account_info())
+                results.append(future.result(timeout=timeout))
             except Exception:
-                continue
-        return accounts
+                results.append(None)
+        return results
+
+    def _fresh_accounts(self, max_age: float = 2.0) -> Optional[list[Dict[str, float]]]:
+        stamp, accounts = self._accounts_cache
+        if accounts and time.monotonic() - stamp < max_age:
+            return accounts
+        return None
+
+    def _store_accounts(self, accounts: list[Dict[str, float]]) -> None:
+        self._accounts_cache = (time.monotonic(), accounts)
+
+    def _account_calls(self) -> list[Optional[Callable[[], Any]]]:
+        return [w.get_account_info if w is not None and w.is_connected else None for w in (self.worker1, self.worker2)]
+
+    def _thread_map_for(self, config: AppConfig) -> Dict[str, ThreadSchedule]:
+        """thread_id -> schedule for *config*, built once per config object."""
+        cached = self._thread_map_cache
+        if cached is None or cached[0] is not config:
+            cached = (
+                config,
+                {thread.thread_id: thread for thread in (*config.primary_threads, *config.wednesday_threads)},
+            )
+            self._thread_map_cache = cached
+        return cached[1]
+
+    def _schedules_for_weekday(self, config: AppConfig, weekday: int) -> tuple[ThreadSchedule, ...]:
+        """Enabled schedules that may run on *weekday*, indexed once per config object."""
+        cached = self._schedule_index
+        if cached is None or cached[0] is not config:
+            index: Dict[int, list[ThreadSchedule]] = {}
+            for schedule in (*config.primary_threads, *config.wednesday_threads):
+                if schedule.enabled:
+                    for day in schedule.weekdays_set:
+                        index.setdefault(day, []).append(schedule)
+            cached = (config, {day: tuple(items) for day, items in index.items()})
+            self._schedule_index = cached
+        return cached[1].get(weekday, ())
 
     def evaluate_automation(self, now: datetime, config: AppConfig, state: AutomationState) -> bool:
         changed = False
-        connected = bool(self.worker1 and self.worker2 and self.connected1 and self.connected2)
+        # Bound once: the loops below reuse them, and a mid-pass disconnect on the
+        # UI thread can't swap a worker out from under one iteration.
+        worker1, worker2 = self.worker1, self.worker2
+        connected = bool(worker1 and worker2 and self.connected1 and self.connected2)
+        # Spreads fetched during this pass, so a symbol is quoted at most once per worker.
+        quote_cache: Dict[tuple[WorkerClient, str], float] = {}
+        # The drawdown check's account snapshots don't depend on the entry or
+        # exit phases, so their RPCs run while those phases quote spreads.
+        # Snapshots younger than 2s (from the last pass or the profit poller)
+        # are reused instead.
+        cached_accounts = self._fresh_accounts() if connected else None
+        account_futures = (
+            self._submit_calls(self._account_calls()) if connected and cached_accounts is None else []
+        )
 
         if connected:
-            all_threads = [*config.primary_threads, *config.wednesday_threads]
-            for schedule in all_threads:
+            for schedule in self._schedules_for_weekday(config, now.weekday()):
                 if not schedule_should_trigger(schedule, now, state):
                     continue
                 symbols = [s for s in (schedule.symbol1, schedule.symbol2) if s]
                 requests = []
                 if schedule.symbol1:
-                    requests.append((self.worker1, schedule.symbol1))
+                    requests.append((worker1, schedule.symbol1))
                 if schedule.symbol2:
-                    requests.append((self.worker2, schedule.symbol2))
-                spreads = self._fetch_spreads(requests)
+                    requests.append((worker2, schedule.symbol2))
+                spreads = self._fetch_spreads(requests, quote_cache)
                 if not spreads_within_entry_limit(symbols, spreads, schedule.max_entry_spread):
                     self._set_automation_status(
                         f"{schedule.name} ({schedule.thread_id}) skipped due to spread limit.",
                         ok=False,
                     )
                     continue
-                self._invoke_on_ui(lambda sch=schedule: self._execute_schedule_trade(sch))
+                self._submit_schedule_trade(schedule)
                 mark_schedule_triggered(state, schedule, now)
                 changed = True
 
         trades, requests, profits = self._gather_active_trades(now, config)
         if trades and connected:
-            spreads = self._fetch_spreads(requests)
-            due_close = trades_due_for_close(trades, now, spreads, profits)
+            spreads = self._fetch_spreads(requests, quote_cache)
+            due_close = trades_due_for_close(trades, now, spreads, profits, time.monotonic())
             if due_close:
                 counts = Counter(reason for _, reason in due_close)
                 parts: list[str] = []
@@ -1667,7 +2219,11 @@ class App:
                 self._close_pair_threadsafe(trade_id, reason=f"auto:{reason}")
 
         if connected:
-            accounts = self._fetch_accounts()
+            if cached_accounts is not None:
+                accounts = cached_accounts
+            else:
+                accounts = [info for info in self._collect(account_futures) if info is not None]
+                self._store_accounts(accounts)
             if accounts and drawdown_breached(config.risk, accounts):
                 if trades:
                     self._set_automation_status("Drawdown stop triggered. Closing all trades.", ok=False)
@@ -1683,16 +2239,15 @@ class App:
             return
 
         try:
-            self.worker1 = WorkerClient("A1", path1)
-            self.worker2 = WorkerClient("A2", path2)
+            self.worker1 = WorkerClient("A1", path1, on_event=partial(self._on_worker_event, 1))
+            self.worker2 = WorkerClient("A2", path2, on_event=partial(self._on_worker_event, 2))
             # Connect in parallel
-            with ThreadPoolExecutor(max_workers=2) as ex:
-                f1 = ex.submit(self.worker1.connect, path1)
-                f2 = ex.submit(self.worker2.connect, path2)
-                d1 = f1.result(timeout=25)
-                d2 = f2.result(timeout=25)
+            f1 = self._broker_pool.submit(self.worker1.connect, path1)
+            f2 = self._broker_pool.submit(self.worker2.connect, path2)
+            d1, d2 = self._await_pair(f1, f2, timeout=25)
             self.connected1 = True
             self.connected2 = True
+            self._profit_poll_wake.set()
             self.status1.configure(text="connected", foreground="#070")
             self.status2.configure(text="connected", foreground="#070")
             login1 = d1.get('login') or 'Account 1'
@@ -1710,30 +2265,45 @@ class App:
         # Backwards-compatible: same side on both accounts
         return self._on_place_mixed(side, side)
 
+    def _collect_order_form(self) -> tuple[str, float, str, float]:
+        fields = (
+            ("Account 1 pair", self.pair1_var, str),
+            ("Account 1 lot size", self.lot1_var, float),
+            ("Account 2 pair", self.pair2_var, str),
+            ("Account 2 lot size", self.lot2_var, float),
+        )
+        values = []
+        for label, var, coerce in fields:
+            raw = var.get().strip()
+            try:
+                values.append(coerce(raw))
+            except ValueError:
+                raise ValueError(f"Invalid {label}: {raw!r}") from None
+        symbol1, lot1, symbol2, lot2 = values
+        return symbol1, lot1, symbol2, lot2
+
     def _on_place_mixed(self, side1: str, side2: str) -> None:
-        symbol1 = self.pair1_var.get().strip()
-        symbol2 = self.pair2_var.get().strip()
         try:
-            lot1 = float(self.lot1_var.get().strip())
-            lot2 = float(self.lot2_var.get().strip())
-        except Exception:
-            messagebox.showerror("Error", "Invalid lot sizes.")
+            symbol1, lot1, symbol2, lot2 = self._collect_order_form()
+        except ValueError as exc:
+            messagebox.showerror("Error", str(exc))
             return
         try:
             self._open_trade_pair(symbol1, lot1, side1, symbol2, lot2, side2)
         except Exception as e:
             messagebox.showerror("Trade Error", str(e))
 
-    def _on_close_pair(self, trade_id: str, reason: Optional[str] = None) -> None:
-        with self._trade_lock:
-            info = self.paired_trades.get(trade_id)
-        if not info:
-            return
-
-        account1_src = info.get('account1', {}) or {}
-        account2_src = info.get('account2', {}) or {}
-        account1 = dict(account1_src)
-        account2 = dict(account2_src)
+    @staticmethod
+    def _closed_history_entry(
+        trade_id: str,
+        info: Dict[str, Any],
+        res1: Optional[Dict[str, Any]],
+        res2: Optional[Dict[str, Any]],
+        reason: Optional[str],
+        close_time: float,
+    ) -> Dict[str, Any]:
+        account1 = dict(info.get('account1', {}) or {})
+        account2 = dict(info.get('account2', {}) or {})
 
         p1_profit = float(account1.get('last_profit', 0.0) or 0.0)
         p2_profit = float(account2.get('last_profit', 0.0) or 0.0)
@@ -1741,22 +2311,14 @@ class App:
         p2_commission = float(account2.get('last_commission', account2.get('commission', 0.0)) or 0.0)
         p1_swap = float(account1.get('last_swap', account1.get('swap', 0.0)) or 0.0)
         p2_swap = float(account2.get('last_swap', account2.get('swap', 0.0)) or 0.0)
-        if self.worker1 and account1_src.get('position'):
-            try:
-                res1 = self.worker1.get_profit(account1_src['position'])
-                p1_profit = float(res1.get('profit', p1_profit))
-                p1_commission = float(res1.get('commission', p1_commission))
-                p1_swap = float(res1.get('swap', p1_swap))
-            except Exception:
-                pass
-        if self.worker2 and account2_src.get('position'):
-            try:
-                res2 = self.worker2.get_profit(account2_src['position'])
-                p2_profit = float(res2.get('profit', p2_profit))
-                p2_commission = float(res2.get('commission', p2_commission))
-                p2_swap = float(res2.get('swap', p2_swap))
-            except Exception:
-                pass
+        if res1 is not None:
+            p1_profit = float(res1.get('profit', p1_profit))
+            p1_commission = float(res1.get('commission', p1_commission))
+            p1_swap = float(res1.get('swap', p1_swap))
+        if res2 is not None:
+            p2_profit = float(res2.get('profit', p2_profit))
+            p2_commission = float(res2.get('commission', p2_commission))
+            p2_swap = float(res2.get('swap', p2_swap))
 
         account1.pop('last_profit', None)
         account2.pop('last_profit', None)
@@ -1764,7 +2326,6 @@ class App:
         account2.pop('last_commission', None)
         account1.pop('last_swap', None)
         account2.pop('last_swap', None)
-        close_time = time.time()
         account1['profit'] = p1_profit
         account2['profit'] = p2_profit
         account1['commission'] = p1_commission
@@ -1772,9 +2333,7 @@ class App:
         account1['swap'] = p1_swap
         account2['swap'] = p2_swap
 
-        close_reason = (reason or "manual")
-
-        history_entry = {
+        return {
             'trade_id': trade_id,
             'schedule': info.get('schedule'),
             'thread_id': info.get('thread_id'),
@@ -1785,42 +2344,116 @@ class App:
             'combined_profit': p1_profit + p2_profit,
             'combined_commission': p1_commission + p2_commission,
             'combined_swap': p1_swap + p2_swap,
-            'close_reason': close_reason,
+            'close_reason': reason or "manual",
         }
 
-        try:
-            with ThreadPoolExecutor(max_workers=2) as ex:
-                futures = []
-                if self.worker1 and account1_src.get('position'):
-                    futures.append(ex.submit(
-                        self.worker1.close,
-                        account1_src.get('position'),
-                        account1_src.get('symbol'),
-                        account1_src.get('side'),
-                        account1_src.get('lot'),
-                        account1_src.get('magic'),
-                    ))
-                if self.worker2 and account2_src.get('position'):
-                    futures.append(ex.submit(
-                        self.worker2.close,
-                        account2_src.get('position'),
-                        account2_src.get('symbol'),
-                        account2_src.get('side'),
-                        account2_src.get('lot'),
-                        account2_src.get('magic'),
-                    ))
-                for future in futures:
-                    future.result(timeout=20)
-            self.table.remove_row(trade_id)
-            with self._trade_lock:
-                self.paired_trades.pop(trade_id, None)
-            self._record_trade_history(history_entry)
-        except Exception as e:
-            messagebox.showerror('Close Error', str(e))
+    def _close_pairs(self, trade_ids: Sequence[str], reason: Optional[str] = None) -> None:
+        """Close several pairs: one profit snapshot per worker, then every leg's close at once."""
+        batch = [(tid, self.paired_trades.get(tid)) for tid in trade_ids]
+        batch = [(tid, info) for tid, info in batch if info]
+        if not batch:
+            return
+        worker1, worker2 = self.worker1, self.worker2
+        legs = [
+            (tid, info, info.get('account1') or _NO_LEG, info.get('account2') or _NO_LEG)
+            for tid, info in batch
+        ]
 
+        # Final P/L has to be read while the positions are still open.
+        tickets1 = [t for t in (self._leg_snapshot(leg1)[0] for _, _, leg1, _ in legs) if t]
+        tickets2 = [t for t in (self._leg_snapshot(leg2)[0] for _, _, _, leg2 in legs) if t]
+        results = self._fan_out([
+            (lambda: worker1.get_profits(tickets1)) if worker1 and tickets1 else None,
+            (lambda: worker2.get_profits(tickets2)) if worker2 and tickets2 else None,
+        ])
+        profits1: Dict[int, Dict[str, Any]] = results[0] or {}
+        profits2: Dict[int, Dict[str, Any]] = results[1] or {}
+        close_time = time.time()
 
-    def _schedule_profit_updates(self) -> None:
-        self.root.after(800, self._update_profits)
+        # One close_batch per terminal; both terminals still close concurrently.
+        owners: tuple[list[str], list[str]] = ([], [])
+        orders: tuple[list[Dict[str, Any]], list[Dict[str, Any]]] = ([], [])
+        for tid, _info, leg1, leg2 in legs:
+            for idx, worker, leg in ((0, worker1, leg1), (1, worker2, leg2)):
+                if worker and leg.get('position'):
+                    owners[idx].append(tid)
+                    orders[idx].append({
+                        "position_ticket": leg.get('position'),
+                        "symbol": leg.get('symbol'),
+                        "side": leg.get('side'),
+                        "volume": leg.get('lot'),
+                        "magic": leg.get('magic'),
+                    })
+        batches = [
+            (owners[idx], self._broker_pool.submit(worker.close_batch, orders[idx]))
+            for idx, worker in enumerate((worker1, worker2))
+            if orders[idx]
+        ]
+
+        failures: Dict[str, str] = {}
+        for batch_owners, future in batches:
+            try:
+                outcomes = future.result(timeout=20 * len(batch_owners))
+            except Exception as e:
+                for tid in batch_owners:
+                    failures.setdefault(tid, str(e))
+                continue
+            for pos, tid in enumerate(batch_owners):
+                outcome = outcomes[pos] if pos < len(outcomes) else {"error": "No close result"}
+                if not outcome.get("ok"):
+                    failures.setdefault(tid, str(outcome.get("error")))
+
+        errors: list[str] = []
+        history: list[Dict[str, Any]] = []
+        for tid, info, leg1, leg2 in legs:
+            if tid in failures:
+                errors.append(f"{tid}: {failures[tid]}" if len(legs) > 1 else failures[tid])
+                continue
+            history.append(self._closed_history_entry(
+                tid,
+                info,
+                profits1.get(self._leg_snapshot(leg1)[0]),
+                profits2.get(self._leg_snapshot(leg2)[0]),
+                reason,
+                close_time,
+            ))
+            self.table.remove_row(tid)
+        if history:
+            self._discard_trades([entry["trade_id"] for entry in history])
+            self._record_trade_histories(history)
+        if errors:
+            messagebox.showerror('Close Error', "\n".join(errors))
+
+    def _start_profit_poller(self) -> None:
+        self._profit_poll_stop.clear()
+        self._profit_poll_thread = threading.Thread(
+            target=self._profit_poll_loop, name="ProfitPoller", daemon=True
+        )
+        self._profit_poll_thread.start()
+
+    def _profit_poll_loop(self) -> None:
+        # Broker I/O happens here; only the resulting numbers are posted to Tk.
+        failures = 0
+        while not self._profit_poll_stop.is_set():
+            if not (self.connected1 or self.connected2):
+                # Nothing to poll until a terminal connects.
+                self._profit_poll_wake.wait()
+            elif failures >= 3:
+                # A terminal keeps failing; stop hammering it until it recovers.
+                self._profit_poll_wake.wait(10.0)
+            else:
+                # Open positions are pushed by the workers as they move; this pass
+                # refreshes balances and reconciles anything a push missed.
+                self._profit_poll_wake.wait(2.0 if self.paired_trades else 5.0)
+            self._profit_poll_wake.clear()
+            if self._profit_poll_stop.is_set():
+                break
+            try:
+                ok = self._poll_profits()
+            except Exception as exc:
+                print(f"Profit poll error: {exc}", file=sys.stderr)
+                ok = False
+            failures = 0 if ok else failures + 1
 
     def _update_utc_clock(self) -> None:
         try:
@@ -1832,125 +2465,249 @@ class App:
             if self.root.winfo_exists():
                 self.root.after(1000, self._update_utc_clock)
 
-    def _update_profits(self) -> None:
+    @staticmethod
+    def _leg_snapshot(account: Mapping[str, Any]) -> tuple[int, float, float, float]:
+        """(ticket, profit, commission, swap) with the cached values as fallbacks."""
         try:
-            with self._trade_lock:
-                snapshot = {tid: dict(info) for tid, info in self.paired_trades.items()}
-            for trade_id, info in snapshot.items():
-                a1 = info.get("account1", {}) or {}
-                a2 = info.get("account2", {}) or {}
-                p1: Optional[Dict[str, Any]] = None
-                if self.worker1 and self.connected1 and a1.get("position"):
-                    try:
-                        p1 = self.worker1.get_profit(a1.get("position"))
-                    except Exception:
-                        p1 = None
-                p2: Optional[Dict[str, Any]] = None
-                if self.worker2 and self.connected2 and a2.get("position"):
-                    try:
-                        p2 = self.worker2.get_profit(a2.get("position"))
-                    except Exception:
-                        p2 = None
+            ticket = int(account.get("position") or 0)
+        except (TypeError, ValueError):
+            ticket = 0
+        return (
+            ticket,
+            _as_float(account.get("last_profit", account.get("profit", 0.0))),
+            _as_float(account.get("last_commission", account.get("commission", 0.0))),
+            _as_float(account.get("last_swap", account.get("swap", 0.0))),
+        )
 
-                p1_profit = float((p1 or {}).get("profit", a1.get("last_profit", a1.get("profit", 0.0))) or 0.0)
-                p2_profit = float((p2 or {}).get("profit", a2.get("last_profit", a2.get("profit", 0.0))) or 0.0)
-                p1_commission = float(
-                    (p1 or {}).get("commission", a1.get("last_commission", a1.get("commission", 0.0))) or 0.0
-                )
-                p1_swap = float((p1 or {}).get("swap", a1.get("last_swap", a1.get("swap", 0.0))) or 0.0)
-                p2_commission = float(
-                    (p2 or {}).get("commission", a2.get("last_commission", a2.get("commission", 0.0))) or 0.0
-                )
-                p2_swap = float((p2 or {}).get("swap", a2.get("last_swap", a2.get("swap", 0.0))) or 0.0)
+    def _poll_profits(self) -> bool:
+        """Fetch profits and account info from both terminals and post results to Tk.
+
+        Each terminal gets a single ``batch`` RPC carrying its profit and account
+        lookups; both are submitted up front and rows/labels are posted once
+        both terminals answer. Returns False if any lookup failed or timed out.
+        """
+        # Copy only the fields the poll reads, as flat tuples.
+        snapshot = [
+            (
+                tid,
+                self._leg_snapshot(info.get("account1") or _NO_LEG),
+                self._leg_snapshot(info.get("account2") or _NO_LEG),
+            )
+            for tid, info in self.paired_trades.items()
+        ]
 
-                p1_open = True if p1 is None else bool(p1.get("open", True))
-                p2_open = True if p2 is None else bool(p2.get("open", True))
+        # One batched RPC per worker instead of one per position.
+        by_ticket1, by_ticket2 = self._trades_by_ticket
+        tickets1 = list(by_ticket1)
+        tickets2 = list(by_ticket2)
+        worker1, worker2 = self.worker1, self.worker2
+        live1 = bool(worker1 and self.connected1)
+        live2 = bool(worker2 and self.connected2)
+        # Per terminal: the result keys its batch fills, and the ops to run.
+        calls: Dict[tuple[str, ...], Callable[[], Any]] = {}
+        for suffix, worker, live, tickets in (("1", worker1, live1, tickets1), ("2", worker2, live2, tickets2)):
+            if not live:
+                continue
+            keys: tuple[str, ...] = ("info" + suffix,)
+            ops: list[tuple[str, Dict[str, Any]]] = [("get_account_info", {})]
+            if tickets:
+                keys = ("profits" + suffix,) + keys
+                ops.insert(0, ("get_profits", {"tickets": tickets}))
+            calls[keys] = partial(worker.batch, ops)
+
+        results: Dict[str, Any] = {}
+        issued = {key for keys in calls for key in keys}
+        waiting = {"rows": {"profits1", "profits2"} & issued, "accounts": {"info1", "info2"} & issued}
+
+        def _post_ready() -> None:
+            if waiting.get("rows") == set():
+                del waiting["rows"]
+                if snapshot:
+                    rows = self._profit_rows(snapshot, results.get("profits1") or {}, results.get("profits2") or {})
+                    self._invoke_on_ui(lambda: self._apply_profit_rows(rows))
+            if waiting.get("accounts") == set():
+                del waiting["accounts"]
+                info1, info2 = results.get("info1") or {}, results.get("info2") or {}
+                self._store_accounts([info for info in (info1, info2) if info])
+                self._invoke_on_ui(lambda: self._apply_account_summaries(info1, info2))
+
+        _post_ready()
+        futures = {self._broker_pool.submit(call): keys for keys, call in calls.items()}
+        ok = True
+        try:
+            for future in as_completed(futures, timeout=20):
+                keys = futures[future]
+                try:
+                    replies = future.result()
+                except Exception:
+                    replies = []
+                for pos, key in enumerate(keys):
+                    reply = replies[pos] if pos < len(replies) else None
+                    if reply is not None and reply.get("status") == "ok":
+                        data = reply.get("data") or {}
+                        results[key] = (data.get("profits") or {}) if key.startswith("profits") else data
+                    else:
+                        results[key] = None
+                        ok = False
+                    for pending in waiting.values():
+                        pending.discard(key)
+                _post_ready()
+        except FuturesTimeoutError:
+            ok = False
+
+        for worker, live, tickets in ((worker1, live1, tickets1), (worker2, live2, tickets2)):
+            if live:
+                self._sync_profit_watch(worker, tickets)
+        return ok
+
+    def _sync_profit_watch(self, worker: WorkerClient, tickets: Sequence[int]) -> None:
+        wanted = frozenset(tickets)
+        if self._profit_watch.get(worker, frozenset()) == wanted:
+            return
+        try:
+            worker.watch_profits(sorted(wanted))
+        except (WorkerRpcError, TimeoutError) as exc:
+            print(f"{worker.name} profit watch failed: {exc}", file=sys.stderr)
+            return
+        self._profit_watch[worker] = wanted
 
-                total = p1_profit + p2_profit
-                combined_commission = p1_commission + p2_commission
-                combined_swap = p1_swap + p2_swap
+    def _on_worker_event(self, leg: int, event: str, data: Dict[str, Any]) -> None:
+        # Runs on a WorkerClient reader thread.
+        if event != "profits":
+            return
+        self._profit_events.put((leg, data.get("profits") or {}))
+        if not self._profit_drain_pending.is_set():
+            self._profit_drain_pending.set()
+            self._invoke_on_ui(self._drain_profit_events)
+
+    def _drain_profit_events(self) -> None:
+        self._profit_drain_pending.clear()
+        profits1: Dict[int, Dict[str, Any]] = {}
+        profits2: Dict[int, Dict[str, Any]] = {}
+        while True:
+            try:
+                leg, profits = self._profit_events.get_nowait()
+            except queue.Empty:
+                break
+            (profits1 if leg == 1 else profits2).update(profits)
+        if not (profits1 or profits2):
+            return
+        trades = self.paired_trades
+        by_ticket1, by_ticket2 = self._trades_by_ticket
+        trade_ids = {by_ticket1[t] for t in profits1 if t in by_ticket1}
+        trade_ids.update(by_ticket2[t] for t in profits2 if t in by_ticket2)
+        snapshot = []
+        for tid in trade_ids:
+            info = trades.get(tid)
+            if info is not None:
+                snapshot.append((
+                    tid,
+                    self._leg_snapshot(info.get("account1") or _NO_LEG),
+                    self._leg_snapshot(info.get("account2") or _NO_LEG),
+                ))
+        if snapshot:
+            self._apply_profit_rows(self._profit_rows(snapshot, profits1, profits2))
 
-                self._update_trade_profit_cache(
-                    trade_id,
-                    p1_profit,
-                    p1_commission,
-                    p1_swap,
-                    p2_profit,
-                    p2_commission,
-                    p2_swap,
-                )
-                self.table.set_metrics(
-                    trade_id,
-                    {
-                        "p1_profit": p1_profit,
-                        "p1_commission": p1_commission,
-                        "p1_swap": p1_swap,
-                        "p2_profit": p2_profit,
-                        "p2_commission": p2_commission,
-                        "p2_swap": p2_swap,
-                        "combined_profit": total,
-                        "combined_commission": combined_commission,
-                        "combined_swap": combined_swap,
-                    },
-                )
+    @staticmethod
+    def _profit_rows(
+        snapshot: Sequence[tuple[str, tuple[int, float, float, float], tuple[int, float, float, float]]],
+        profits1: Dict[int, Dict[str, Any]],
+        profits2: Dict[int, Dict[str, Any]],
+    ) -> list[tuple[str, Dict[str, float], bool]]:
+        rows: list[tuple[str, Dict[str, float], bool]] = []
+        for trade_id, (ticket1, profit1, commission1, swap1), (ticket2, profit2, commission2, swap2) in snapshot:
+            p1: Optional[Dict[str, Any]] = profits1.get(ticket1)
+            p2: Optional[Dict[str, Any]] = profits2.get(ticket2)
+
+            # The worker already sends native floats and the fallbacks were
+            # normalised in _leg_snapshot, so no per-field casts are needed.
+            src1 = p1 or _NO_LEG
+            src2 = p2 or _NO_LEG
+            p1_profit = src1.get("profit", profit1)
+            p2_profit = src2.get("profit", profit2)
+            p1_commission = src1.get("commission", commission1)
+            p1_swap = src1.get("swap", swap1)
+            p2_commission = src2.get("commission", commission2)
+            p2_swap = src2.get("swap", swap2)
+
+            p1_open = True if p1 is None else bool(p1.get("open", True))
+            p2_open = True if p2 is None else bool(p2.get("open", True))
+
+            metrics = {
+                "p1_profit": p1_profit,
+                "p1_commission": p1_commission,
+                "p1_swap": p1_swap,
+                "p2_profit": p2_profit,
+                "p2_commission": p2_commission,
+                "p2_swap": p2_swap,
+                "combined_profit": p1_profit + p2_profit,
+                "combined_commission": p1_commission + p2_commission,
+                "combined_swap": p1_swap + p2_swap,
+            }
+            rows.append((trade_id, metrics, not p1_open and not p2_open))
+        return rows
+
+    def _apply_profit_rows(self, rows: Sequence[tuple[str, Dict[str, float], bool]]) -> None:
+        self._update_trade_profit_caches(rows)
+        closed_rows: list[tuple[str, Dict[str, float]]] = []
+        for trade_id, metrics, closed in rows:
+            self.table.set_metrics(trade_id, metrics)
+            if closed:
+                closed_rows.append((trade_id, metrics))
+        if not closed_rows:
+            return
 
-                if not p1_open and not p2_open:
-                    with self._trade_lock:
-                        original = self.paired_trades.pop(trade_id, None)
-                    self.table.remove_row(trade_id)
-                    if original:
-                        account1_entry = dict(original.get("account1", {}) or {})
-                        account2_entry = dict(original.get("account2", {}) or {})
-                        profit1 = float(account1_entry.get("last_profit", p1_profit) or 0.0)
-                        profit2 = float(account2_entry.get("last_profit", p2_profit) or 0.0)
-                        commission1 = float(account1_entry.get("last_commission", p1_commission) or 0.0)
-                        commission2 = float(account2_entry.get("last_commission", p2_commission) or 0.0)
-                        swap1 = float(account1_entry.get("last_swap", p1_swap) or 0.0)
-                        swap2 = float(account2_entry.get("last_swap", p2_swap) or 0.0)
-                        account1_entry.pop("last_profit", None)
-                        account2_entry.pop("last_profit", None)
-                        account1_entry.pop("last_commission", None)
-                        account2_entry.pop("last_commission", None)
-                        account1_entry.pop("last_swap", None)
-                        account2_entry.pop("last_swap", None)
-                        account1_entry["profit"] = profit1
-                        account2_entry["profit"] = profit2
-                        account1_entry["commission"] = commission1
-                        account2_entry["commission"] = commission2
-                        account1_entry["swap"] = swap1
-                        account2_entry["swap"] = swap2
-                        history_entry = {
-                            "trade_id": trade_id,
-                            "schedule": original.get("schedule"),
-                            "thread_id": original.get("thread_id"),
-                            "opened_at": float(original.get("opened_at", 0.0) or 0.0),
-                            "closed_at": time.time(),
-                            "account1": account1_entry,
-                            "account2": account2_entry,
-                            "combined_profit": account1_entry["profit"] + account2_entry["profit"],
-                            "combined_commission": commission1 + commission2,
-                            "combined_swap": swap1 + swap2,
-                        }
-                        self._record_trade_history(history_entry)
-        finally:
-            self._refresh_account_summaries()
-            self._schedule_profit_updates()
+        removed = self._discard_trades([trade_id for trade_id, _ in closed_rows])
+        history: list[Dict[str, Any]] = []
+        for trade_id, metrics in closed_rows:
+            self.table.remove_row(trade_id)
+            original = removed.get(trade_id)
+            if not original:
+                continue
+            account1_entry = dict(original.get("account1", {}) or {})
+            account2_entry = dict(original.get("account2", {}) or {})
+            profit1 = float(account1_entry.get("last_profit", metrics["p1_profit"]) or 0.0)
+            profit2 = float(account2_entry.get("last_profit", metrics["p2_profit"]) or 0.0)
+            commission1 = float(account1_entry.get("last_commission", metrics["p1_commission"]) or 0.0)
+            commission2 = float(account2_entry.get("last_commission", metrics["p2_commission"]) or 0.0)
+            swap1 = float(account1_entry.get("last_swap", metrics["p1_swap"]) or 0.0)
+            swap2 = float(account2_entry.get("last_swap", metrics["p2_swap"]) or 0.0)
+            account1_entry.pop("last_profit", None)
+            account2_entry.pop("last_profit", None)
+            account1_entry.pop("last_commission", None)
+            account2_entry.pop("last_commission", None)
+            account1_entry.pop("last_swap", None)
+            account2_entry.pop("last_swap", None)
+            account1_entry["profit"] = profit1
+            account2_entry["profit"] = profit2
+            account1_entry["commission"] = commission1
+            account2_entry["commission"] = commission2
+            account1_entry["swap"] = swap1
+            account2_entry["swap"] = swap2
+            history_entry = {
+                "trade_id": trade_id,
+                "schedule": original.get("schedule"),
+                "thread_id": original.get("thread_id"),
+                "opened_at": float(original.get("opened_at", 0.0) or 0.0),
+                "closed_at": time.time(),
+                "account1": account1_entry,
+                "account2": account2_entry,
+                "combined_profit": account1_entry["profit"] + account2_entry["profit"],
+                "combined_commission": commission1 + commission2,
+                "combined_swap": swap1 + swap2,
+            }
+            history.append(history_entry)
+        if history:
+            self._record_trade_histories(history)
 
     def _refresh_account_summaries(self) -> None:
-        info1: Dict[str, Any] = {}
-        info2: Dict[str, Any] = {}
-
-        if self.worker1 and self.connected1:
-            try:
-                info1 = self.worker1.get_account_info() or {}
-            except Exception:
-                info1 = {}
-        if self.worker2 and self.connected2:
-            try:
-                info2 = self.worker2.get_account_info() or {}
-            except Exception:
-                info2 = {}
+        results = self._fan_out([
+            self.worker1.get_account_info if self.worker1 and self.connected1 else None,
+            self.worker2.get_account_info if self.worker2 and self.connected2 else None,
+        ])
+        self._apply_account_summaries(results[0] or {}, results[1] or {})
 
+    def _apply_account_summaries(self, info1: Dict[str, Any], info2: Dict[str, Any]) -> None:
         balance1 = self._format_money(info1.get("balance")) if info1 else "--"
         equity1 = self._format_money(info1.get("equity")) if info1 else "--"
         balance2 = self._format_money(info2.get("balance")) if info2 else "--"
@@ -1962,14 +2719,19 @@ class App:
         self.account2_equity_var.set(f"Equity: {equity2}")
 
     def _cleanup_workers(self) -> None:
-        for w in (self.worker1, self.worker2):
-            if w is not None:
-                try:
-                    w.shutdown()
-                except Exception:
-                    pass
+        workers = [w for w in (self.worker1, self.worker2) if w is not None]
+        if workers:
+            # Shut both down side by side so a hung terminal costs 2s once, not per worker.
+            with ThreadPoolExecutor(max_workers=len(workers), thread_name_prefix="shutdown") as pool:
+                for future in [pool.submit(w.shutdown, 2.0) for w in workers]:
+                    try:
+                        future.result()
+                    except Exception:
+                        pass
         self.worker1 = None
         self.worker2 = None
+        self._profit_watch.clear()
+        self._store_accounts([])
         self.connected1 = False
         self.connected2 = False
         self.status1.configure(text="disconnected", foreground="#b00")
@@ -1981,7 +2743,23 @@ class App:
         self._set_automation_status("Disconnected from terminals.", ok=False)
 
     def on_close(self) -> None:
+        self._profit_poll_stop.set()
+        self._profit_poll_wake.set()
+        # No new scheduled entries from here on.
         self.automation_runner.stop()
+        # An entry already sending its orders must finish with the workers live:
+        # cancelling under it would leave a filled position that is never
+        # published or saved. Entries still queued are dropped.
+        self._dispatch_pool.shutdown(wait=True, cancel_futures=True)
+        for w in (self.worker1, self.worker2):
+            if w is not None:
+                w.cancel_pending()
+        # The entry's own _save_state was posted to a Tk loop that is about to be
+        # destroyed, so snapshot here; stopping the writer then flushes it along
+        # with the runner's final tick.
+        self._save_state()
+        self._state_writer.stop()
+        self._broker_pool.shutdown(wait=False, cancel_futures=True)
         self._cleanup_workers()
         self.root.destroy()
 
@@ -1,19 +1,40 @@
 import os
+import random
+import sys
 import time
 import traceback
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
 
 try:
     import MetaTrader5 as MT5
 except Exception as exc:  # pragma: no cover
     MT5 = None  # type: ignore
 
+# Resolved once at import: filling modes in discovery order (FOK first) and
+# the retcodes that mean "try another filling mode".
+if MT5 is not None:
+    _FILLING_MODES: Tuple[int, ...] = (
+        int(MT5.ORDER_FILLING_FOK),
+        int(MT5.ORDER_FILLING_IOC),
+        int(MT5.ORDER_FILLING_RETURN),
+    )
+    _RETCODE_DONE = int(MT5.TRADE_RETCODE_DONE)
+    _FILL_REJECT_RETCODES = frozenset({10030, int(getattr(MT5, "TRADE_RETCODE_INVALID_FILL", 10031))})
+else:  # pragma: no cover
+    _FILLING_MODES = ()
+    _RETCODE_DONE = 10009
+    _FILL_REJECT_RETCODES = frozenset()
+
 try:
     from win32com.client import Dispatch  # type: ignore
 except Exception:  # pragma: no cover
     Dispatch = None  # type: ignore
 
 
+# Expanded .lnk path -> (shortcut mtime, resolved (target, portable)).
+_LNK_CACHE: Dict[str, Tuple[float, Tuple[str, bool]]] = {}
+
+
 def _resolve_terminal(path: str) -> Tuple[str, bool]:
     """Resolve terminal path and whether '/portable' should be used.
 
@@ -24,75 +45,109 @@ def _resolve_terminal(path: str) -> Tuple[str, bool]:
     path = os.path.expandvars(path)
     portable = False
     if path.lower().endswith(".lnk") and Dispatch is not None:
+        # Shortcut resolution spins up a COM object; reuse the answer until
+        # the .lnk file itself changes.
         try:
-            shell = Dispatch("WScript.Shell")
-            # CreateShortcut is the canonical method name
-            shortcut = shell.CreateShortcut(path)
-            target = shortcut.Targetpath
-            args = (getattr(shortcut, "Arguments", "") or "")
-            if isinstance(args, str) and "/portable" in args.lower():
-                portable = True
-            if target and os.path.exists(target):
-                return target, portable
-        except Exception:
-            pass
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        cached = _LNK_CACHE.get(path)
+        if cached is not None and mtime is not None and cached[0] == mtime:
+            return cached[1]
+        resolved = _resolve_shortcut(path)
+        if mtime is not None:
+            _LNK_CACHE[path] = (mtime, resolved)
+        return resolved
+    return path, portable
+
+
+def _resolve_shortcut(path: str) -> Tuple[str, bool]:
+    """Target of a ``.lnk`` shortcut and whether it passes '/portable'."""
+    portable = False
+    try:
+        shell = Dispatch("WScript.Shell")
+        # CreateShortcut is the canonical method name
+        shortcut = shell.CreateShortcut(path)
+        target = shortcut.Targetpath
+        args = (getattr(shortcut, "Arguments", "") or "")
+        if isinstance(args, str) and "/portable" in args.lower():
+            portable = True
+        if target and os.path.exists(target):
+            return target, portable
+    except Exception:
+        pass
     return path, portable
 
 
+# Symbols confirmed visible in Market Watch this session. Dropped again when
+# a tick lookup fails, in case the symbol was hidden in the terminal since.
+_SELECTED: set[str] = set()
+
+
 def _ensure_symbol_selected(symbol: str) -> Tuple[bool, Optional[str]]:
+    if symbol in _SELECTED:
+        return True, None
     info = MT5.symbol_info(symbol)
     if info is None:
         return False, f"Symbol not found: {symbol}"
     if not info.visible:
         if not MT5.symbol_select(symbol, True):
             return False, f"Failed to select symbol: {symbol}"
+    _SELECTED.add(symbol)
     return True, None
 
 
-def _pick_filling_mode(symbol: str) -> int:
+# Last filling mode the broker accepted per symbol, so repeat orders skip the
+# symbol_info lookup and any rejected attempts.
+_FILL_MODE_CACHE: Dict[str, int] = {}
+
+
+def _filling_candidates(symbol: str, cached: Optional[int]):
+    """Yield filling modes to try: the cached one, then the usual discovery order.
+
+    symbol_info is only queried if the cached mode is missing or rejected.
+    """
+    if cached is not None:
+        yield cached
     info = MT5.symbol_info(symbol)
-    if info is None:
-        return MT5.ORDER_FILLING_FOK
-    # Prefer the broker-supported filling mode if provided; fallback to FOK
-    if getattr(info, "filling_mode", None) in (
-        MT5.ORDER_FILLING_FOK,
-        MT5.ORDER_FILLING_IOC,
-        MT5.ORDER_FILLING_RETURN,
-    ):
-        return int(info.filling_mode)
-    return MT5.ORDER_FILLING_FOK
+    seen = {cached}
+    # Start with symbol's declared filling mode if valid
+    fm = getattr(info, "filling_mode", None) if info else None
+    for mode in (fm, *_FILLING_MODES):
+        if mode in _FILLING_MODES:
+            m = int(mode)
+            if m not in seen:
+                seen.add(m)
+                yield m
 
 
 def _order_send_with_filling(request_base: Dict[str, Any]):
     """Try sending with multiple filling modes to avoid 10030 errors.
 
+    ``request_base`` is owned by this call: its ``type_filling`` is rewritten
+    in place for each attempt rather than copying the request.
+
     Returns (ok: bool, result_or_error: Any)
     """
     symbol = request_base.get("symbol")
-    info = MT5.symbol_info(symbol)
-
-    candidates = []
-    # Start with symbol's declared filling mode if valid
-    fm = getattr(info, "filling_mode", None) if info else None
-    for mode in [fm, MT5.ORDER_FILLING_FOK, MT5.ORDER_FILLING_IOC, MT5.ORDER_FILLING_RETURN]:
-        if mode in (MT5.ORDER_FILLING_FOK, MT5.ORDER_FILLING_IOC, MT5.ORDER_FILLING_RETURN):
-            m = int(mode)
-            if m not in candidates:
-                candidates.append(m)
+    cached = _FILL_MODE_CACHE.get(symbol)
 
     last_error = None
-    for mode in candidates:
-        req = dict(request_base)
-        req["type_filling"] = mode
-        result = MT5.order_send(req)
+    for mode in _filling_candidates(symbol, cached):
+        request_base["type_filling"] = mode
+        result = MT5.order_send(request_base)
         if result is None:
             last_error = {"error": "order_send returned None"}
             continue
-        if result.retcode == MT5.TRADE_RETCODE_DONE:
+        if result.retcode == _RETCODE_DONE:
+            _FILL_MODE_CACHE[symbol] = mode
             return True, result
         comment = getattr(result, "comment", "") or ""
-        if int(result.retcode) in (10030, getattr(MT5, "TRADE_RETCODE_INVALID_FILL", 10031)) or "filling" in comment.lower():
+        if int(result.retcode) in _FILL_REJECT_RETCODES or "filling" in comment.lower():
             last_error = {"error": f"Unsupported filling mode {mode}: {result.retcode} {comment}"}
+            if mode == cached:
+                # Broker changed its rules; rediscover from scratch.
+                _FILL_MODE_CACHE.pop(symbol, None)
             continue
         # Different error - abort
         return False, {"error": f"Order rejected {result.retcode}: {comment}"}
@@ -100,16 +155,35 @@ def _order_send_with_filling(request_base: Dict[str, Any]):
     return False, last_error or {"error": "All filling modes rejected"}
 
 
-def _find_position_ticket(symbol: str, magic: int, comment_substr: str, retries: int = 10) -> int:
-    for _ in range(retries):
+def _backoff_poll(fn, max_total: float = 1.0, base: float = 0.02, cap: float = 0.2):
+    """Call ``fn`` until it returns something truthy or ``max_total`` seconds pass.
+
+    Sleeps use full-jitter exponential backoff, so a quick terminal is re-polled
+    almost at once while a slow one is not hammered. Returns the last result.
+    """
+    deadline = time.monotonic() + max_total
+    attempt = 0
+    while True:
+        result = fn()
+        if result:
+            return result
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return result
+        time.sleep(min(remaining, random.uniform(0, min(cap, base * 2 ** attempt))))
+        attempt += 1
+
+
+def _find_position_ticket(symbol: str, magic: int, comment_substr: str, max_total: float = 0.5) -> int:
+    def lookup() -> int:
         positions = MT5.positions_get(symbol=symbol)
-        if positions:
-            for pos in positions:
-                pos_comment = getattr(pos, "comment", "") or ""
-                if int(getattr(pos, "magic", 0)) == int(magic) and comment_substr in pos_comment:
-                    return int(pos.ticket)
-        time.sleep(0.05)
-    return 0
+        for pos in positions or ():
+            pos_comment = getattr(pos, "comment", "") or ""
+            if int(getattr(pos, "magic", 0)) == int(magic) and comment_substr in pos_comment:
+                return int(pos.ticket)
+        return 0
+
+    return _backoff_poll(lookup, max_total=max_total)
 
 
 def _submit_market_order(
@@ -126,6 +200,7 @@ def _submit_market_order(
 
     tick = MT5.symbol_info_tick(symbol)
     if tick is None:
+        _SELECTED.discard(symbol)
         return False, {"error": f"No tick data for symbol: {symbol}"}
 
     order_type = MT5.ORDER_TYPE_BUY if side.lower() == "buy" else MT5.ORDER_TYPE_SELL
@@ -141,12 +216,16 @@ def _submit_market_order(
         "magic": int(magic),
         "comment": comment,
         "type_time": MT5.ORDER_TIME_GTC,
+        "type_filling": 0,  # set per attempt by _order_send_with_filling
     }
 
     ok_send, send_res = _order_send_with_filling(request_base)
     if not ok_send:
         return False, send_res
     result = send_res
+    # Stamped as soon as the fill is confirmed: the tick's own time is the last
+    # quote, which on a thin cross near rollover can be minutes old.
+    filled_at = int(time.time())
 
     position_ticket = int(getattr(result, "position", 0) or 0)
     if position_ticket == 0:
@@ -156,21 +235,25 @@ def _submit_market_order(
     if position_ticket == 0:
         return False, {"error": "Opened but failed to determine position ticket"}
 
-    # Fetch position details for entry price/time
-    entry_price = None
-    entry_time = None
+    # The fill price comes back on the send result, so a fresh position has
+    # nothing else worth a terminal call: commission and swap are reported as
+    # zero here and arrive later with the profit feed.
+    entry_price = float(getattr(result, "price", 0.0) or 0.0) or None
+    entry_time = filled_at
     commission = 0.0
     swap = 0.0
-    try:
-        pos_det = MT5.positions_get(ticket=int(position_ticket))
-        if pos_det:
-            pos0 = pos_det[0]
-            entry_price = float(getattr(pos0, "price_open", 0.0) or 0.0)
-            entry_time = int(getattr(pos0, "time", 0) or 0)
-            commission = float(getattr(pos0, "commission", 0.0) or 0.0)
-            swap = float(getattr(pos0, "swap", 0.0) or 0.0)
-    except Exception:
-        pass
+    if entry_price is None:
+        # Some brokers leave the result price empty; read the position instead.
+        try:
+            pos_det = MT5.positions_get(ticket=int(position_ticket))
+            if pos_det:
+                pos0 = pos_det[0]
+                entry_price = float(getattr(pos0, "price_open", 0.0) or 0.0)
+                entry_time = int(getattr(pos0, "time", 0) or 0) or filled_at
+                commission = float(getattr(pos0, "commission", 0.0) or 0.0)
+                swap = float(getattr(pos0, "swap", 0.0) or 0.0)
+        except Exception:
+            pass
 
     return True, {
         "position_ticket": position_ticket,
@@ -198,6 +281,7 @@ def _close_position_by_ticket(
 
     tick = MT5.symbol_info_tick(symbol)
     if tick is None:
+        _SELECTED.discard(symbol)
         return False, {"error": f"No tick data for symbol: {symbol}"}
 
     # Opposite side to close
@@ -214,6 +298,7 @@ def _close_position_by_ticket(
         "deviation": int(deviation),
         "magic": int(magic),
         "type_time": MT5.ORDER_TIME_GTC,
+        "type_filling": 0,  # set per attempt by _order_send_with_filling
     }
 
     ok_send, result = _order_send_with_filling(request_base)
@@ -221,42 +306,110 @@ def _close_position_by_ticket(
         return False, result
 
     # Confirm the position is no longer open; retry briefly if required
-    for _ in range(10):
+    def position_gone() -> bool:
         try:
-            remaining = MT5.positions_get(ticket=int(position_ticket))
+            return not MT5.positions_get(ticket=int(position_ticket))
         except Exception:
-            remaining = None
-        if not remaining:
-            return True, {"closed": True}
-        time.sleep(0.1)
+            return True
 
+    if _backoff_poll(position_gone, max_total=1.0):
+        return True, {"closed": True}
     return False, {"error": "Position still open after close attempt"}
 
 
+def _position_profit(pos) -> Dict[str, Any]:
+    return {
+        "open": True,
+        "profit": float(getattr(pos, "profit", 0.0) or 0.0),
+        "volume": float(getattr(pos, "volume", 0.0) or 0.0),
+        "entry_price": float(getattr(pos, "price_open", 0.0) or 0.0),
+        "entry_time": int(getattr(pos, "time", 0) or 0),
+        "commission": float(getattr(pos, "commission", 0.0) or 0.0),
+        "swap": float(getattr(pos, "swap", 0.0) or 0.0),
+    }
+
+
 def _get_profit_by_ticket(position_ticket: int) -> Tuple[bool, Dict[str, Any]]:
     positions = MT5.positions_get(ticket=int(position_ticket))
     if positions:
-        pos = positions[0]
-        return True, {
-            "open": True,
-            "profit": float(getattr(pos, "profit", 0.0) or 0.0),
-            "volume": float(getattr(pos, "volume", 0.0) or 0.0),
-            "entry_price": float(getattr(pos, "price_open", 0.0) or 0.0),
-            "entry_time": int(getattr(pos, "time", 0) or 0),
-            "commission": float(getattr(pos, "commission", 0.0) or 0.0),
-            "swap": float(getattr(pos, "swap", 0.0) or 0.0),
-        }
+        return True, _position_profit(positions[0])
     return True, {"open": False, "profit": 0.0}
 
 
+def _close_from_params(params: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+    """Validate a ``close`` request payload and close that position."""
+    try:
+        position_ticket = int(params.get("position_ticket", 0))
+        volume = float(params.get("volume", 0))
+        magic = int(params.get("magic", 0))
+        deviation = int(params.get("deviation", 20))
+    except (TypeError, ValueError):
+        return False, {"error": "Invalid close params"}
+    symbol = params.get("symbol")
+    if position_ticket <= 0 or not symbol or volume <= 0:
+        return False, {"error": "Invalid close params"}
+    return _close_position_by_ticket(
+        position_ticket=position_ticket,
+        symbol=symbol,
+        side=str(params.get("side") or ""),
+        volume=volume,
+        magic=magic,
+        deviation=deviation,
+    )
+
+
+def _get_profits(tickets: Sequence[int]) -> Tuple[bool, Dict[str, Any]]:
+    """Profit snapshot for several position tickets in one terminal call.
+
+    Returns ``{"profits": {ticket: profit_dict}}`` where tickets that are no
+    longer open map to ``{"open": False, "profit": 0.0}``.
+    """
+    wanted = {int(t) for t in tickets if int(t) > 0}
+    profits: Dict[int, Dict[str, Any]] = {}
+    if not wanted:
+        return True, {"profits": profits}
+    positions = MT5.positions_get()
+    if positions is None:
+        return False, {"error": f"positions_get failed: {MT5.last_error()}"}
+    for pos in positions:
+        ticket = int(getattr(pos, "ticket", 0) or 0)
+        if ticket in wanted:
+            profits[ticket] = _position_profit(pos)
+    for ticket in wanted:
+        if ticket not in profits:
+            profits[ticket] = {"open": False, "profit": 0.0}
+    return True, {"profits": profits}
+
+
+# symbol -> (monotonic fetch time, tick) for read-only quote lookups.
+_TICK_CACHE: Dict[str, Tuple[float, Any]] = {}
+
+
+def _cached_tick(symbol: str, ttl: float = 0.05):
+    """Last tick for *symbol*, reused for up to *ttl* seconds.
+
+    Only for display/monitoring reads: order pricing must always call
+    ``MT5.symbol_info_tick`` directly so it never trades on a stale quote.
+    """
+    now = time.monotonic()
+    cached = _TICK_CACHE.get(symbol)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+    tick = MT5.symbol_info_tick(symbol)
+    if tick is not None:
+        _TICK_CACHE[symbol] = (now, tick)
+    return tick
+
+
 def _get_quote(symbol: str) -> Tuple[bool, Dict[str, Any]]:
     if not symbol:
         return False, {"error": "Symbol required"}
     ok, err = _ensure_symbol_selected(symbol)
     if not ok:
         return False, {"error": err}
-    tick = MT5.symbol_info_tick(symbol)
+    tick = _cached_tick(symbol)
     if tick is None:
+        _SELECTED.discard(symbol)
         return False, {"error": f"No tick data for symbol: {symbol}"}
     bid = float(getattr(tick, "bid", 0.0) or 0.0)
     ask = float(getattr(tick, "ask", 0.0) or 0.0)
@@ -269,6 +422,39 @@ def _get_quote(symbol: str) -> Tuple[bool, Dict[str, Any]]:
     }
 
 
+def _get_quotes(symbols: Sequence[str]) -> Tuple[bool, Dict[str, Any]]:
+    """Quotes for several symbols; per-symbol failures are reported in ``errors``."""
+    quotes: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    for symbol in symbols:
+        symbol = str(symbol or "")
+        if not symbol or symbol in quotes:
+            continue
+        ok, data = _get_quote(symbol)
+        if ok:
+            quotes[symbol] = data
+        else:
+            errors[symbol] = str(data.get("error"))
+    return True, {"quotes": quotes, "errors": errors}
+
+
+def _safe_payload(obj: Any) -> Any:
+    """Plain dict/list/scalar copy of *obj*, safe to pickle across the pipe.
+
+    Handlers already project MT5 records field by field; this is for the few
+    raw values (e.g. ``MT5.version()``) passed through as-is.
+    """
+    if obj is None or isinstance(obj, (str, int, float)):
+        return obj
+    if isinstance(obj, dict):
+        return {(k if isinstance(k, (str, int)) else str(k)): _safe_payload(v) for k, v in obj.items()}
+    if hasattr(obj, "_asdict"):
+        return _safe_payload(obj._asdict())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [_safe_payload(v) for v in obj]
+    return str(obj)
+
+
 def _get_account_overview() -> Tuple[bool, Dict[str, Any]]:
     info = MT5.account_info()
     if info is None:
@@ -281,15 +467,121 @@ def _get_account_overview() -> Tuple[bool, Dict[str, Any]]:
     }
 
 
-def worker_main(request_queue, response_queue, terminal_path: Optional[str] = None, label: str = "") -> None:
+def _open_from_params(side: str, params: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+    """Validate a ``buy``/``sell`` request payload and open that position."""
+    symbol = params.get("symbol")
+    volume = float(params.get("volume", 0))
+    if not symbol or volume <= 0:
+        return False, {"error": "Invalid symbol or volume"}
+    return _submit_market_order(
+        symbol=symbol,
+        side=side,
+        volume=volume,
+        comment=f"PAIR:{params.get('pair_id')}",
+        magic=int(params.get("magic", 0)),
+        deviation=int(params.get("deviation", 20)),
+    )
+
+
+def _close_batch(params: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+    # One round trip for every leg this terminal holds; each order still
+    # succeeds or fails on its own.
+    results = []
+    for order in params.get("orders") or []:
+        ok, data = _close_from_params(order)
+        if ok:
+            results.append({"ok": True, "data": data})
+        else:
+            results.append({"ok": False, "error": str(data.get("error"))})
+    return True, {"results": results}
+
+
+# Commands that need no worker-loop state: cmd -> handler(params) -> (ok, data).
+# connect, watch_profits and shutdown touch loop state and are handled inline.
+_COMMANDS: Dict[str, Callable[[Dict[str, Any]], Tuple[bool, Dict[str, Any]]]] = {
+    "buy": lambda params: _open_from_params("buy", params),
+    "sell": lambda params: _open_from_params("sell", params),
+    "close": _close_from_params,
+    "close_batch": _close_batch,
+    "get_profit": lambda params: _get_profit_by_ticket(int(params.get("position_ticket", 0))),
+    "get_profits": lambda params: _get_profits(params.get("tickets") or []),
+    "get_quote": lambda params: _get_quote(str(params.get("symbol") or "")),
+    "get_quotes": lambda params: _get_quotes(params.get("symbols") or []),
+    "get_account_info": lambda params: _get_account_overview(),
+}
+_REQUIRES_CONNECTION = frozenset({"buy", "sell", "close", "close_batch"})
+
+
+def _run_batch(ops: Sequence[Dict[str, Any]], connected: bool) -> Dict[str, Any]:
+    """Run several table commands back to back for the ``batch`` command.
+
+    Each op is ``{cmd, params}``; results come back in order in the usual
+    ``{status, data, error}`` response shape, one failing op not stopping
+    the rest.
+    """
+    results = []
+    for op in ops:
+        cmd = str(op.get("cmd") or "").lower()
+        handler = _COMMANDS.get(cmd)
+        if handler is None:
+            results.append({"status": "error", "data": None, "error": f"Unknown cmd: {cmd}"})
+            continue
+        if cmd in _REQUIRES_CONNECTION and not connected:
+            results.append({"status": "error", "data": None, "error": "Not connected"})
+            continue
+        try:
+            ok, data = handler(op.get("params") or {})
+        except Exception as e:
+            ok, data = False, {"error": str(e)}
+        if ok:
+            results.append({"status": "ok", "data": data, "error": None})
+        else:
+            results.append({"status": "error", "data": None, "error": str(data.get("error"))})
+    return {"results": results}
+
+
+def worker_main(conn, terminal_path: Optional[str] = None, label: str = "") -> None:
     """Worker process entrypoint. One worker per MT5 terminal.
 
+    ``conn`` is the child end of a duplex ``multiprocessing`` pipe.
+
     Communications protocol:
-      Req: {id, cmd, params}
+      Req: {id: int, cmd, params}
       Res: {id, status: 'ok'|'error', data?, error?}
+      Event: {id: 0, event: 'profits', data: {profits: {ticket: profit_dict}}}
+
+    ``batch`` takes ``{ops: [{cmd, params}, ...]}`` and answers with
+    ``{results: [Res-shaped dict, ...]}`` so several lookups share one trip.
+
+    Profit events are pushed unprompted for tickets registered with
+    ``watch_profits``, and only for positions whose figures changed.
     """
-    def respond(req_id: str, status: str, data: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
-        response_queue.put({"id": req_id, "status": status, "data": data, "error": error})
+    def respond(req_id: int, status: str, data: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        # Only the field that applies goes on the wire (the client reads both
+        # with .get), so every reply pickles one key fewer.
+        if error is None:
+            conn.send({"id": req_id, "status": status, "data": data})
+        else:
+            conn.send({"id": req_id, "status": status, "error": error})
+
+    watched: Dict[int, Optional[Dict[str, Any]]] = {}
+    watch_interval = 0.25
+    next_watch = 0.0
+
+    def push_profit_changes() -> None:
+        ok, data = _get_profits(list(watched))
+        if not ok:
+            return
+        changed: Dict[int, Dict[str, Any]] = {}
+        for ticket, profit in data["profits"].items():
+            if watched.get(ticket) != profit:
+                changed[ticket] = profit
+                watched[ticket] = profit
+            if not profit.get("open", True):
+                # Reported closed once; nothing more will change for it.
+                watched.pop(ticket, None)
+        if changed:
+            conn.send({"id": 0, "event": "profits", "data": {"profits": changed}})
 
     try:
         if MT5 is None:
@@ -299,15 +591,38 @@ def worker_main(request_queue, response_queue, terminal_path: Optional[str] = No
         resolved_path, resolved_portable = _resolve_terminal(terminal_path or "")
 
         while True:
-            req = request_queue.get()
+            if watched and connected:
+                # Requests already waiting are served before an overdue push,
+                # so a burst of orders/closes drains back to back.
+                wait = max(0.0, next_watch - time.monotonic())
+                if not conn.poll(wait):
+                    push_profit_changes()
+                    next_watch = time.monotonic() + watch_interval
+                    continue
+            try:
+                req = conn.recv()
+            except EOFError:
+                # Parent closed its end of the pipe; nothing left to serve.
+                break
             if req is None:
                 break
-            req_id = req.get("id", "")
+            req_id = req.get("id", 0)
             cmd = (req.get("cmd") or "").lower()
             params = req.get("params") or {}
 
             try:
-                if cmd == "connect":
+                handler = _COMMANDS.get(cmd)
+                if handler is not None:
+                    if cmd in _REQUIRES_CONNECTION and not connected:
+                        respond(req_id, "error", error="Not connected")
+                        continue
+                    ok, data = handler(params)
+                    if not ok:
+                        respond(req_id, "error", error=str(data.get("error")))
+                    else:
+                        respond(req_id, "ok", data=data)
+
+                elif cmd == "connect":
                     path_arg, portable_flag = _resolve_terminal(params.get("path") or resolved_path)
                     if not path_arg:
                         respond(req_id, "error", error="Terminal path is required")
@@ -365,13 +680,15 @@ def worker_main(request_queue, response_queue, terminal_path: Optional[str] = No
                         continue
 
                     connected = True
+                    # New terminal session: re-check symbol visibility.
+                    _SELECTED.clear()
                     ver = MT5.version()
                     respond(
                         req_id,
                         "ok",
                         data={
                             "connected": True,
-                            "version": ver,
+                            "version": _safe_payload(ver),
                             "path": path_arg,
                             "portable": bool(portable_flag),
                             "login": int(getattr(acc, "login", 0) or 0),
@@ -379,79 +696,17 @@ def worker_main(request_queue, response_queue, terminal_path: Optional[str] = No
                         },
                     )
 
-                elif cmd in ("buy", "sell"):
-                    if not connected:
-                        respond(req_id, "error", error="Not connected")
-                        continue
-                    symbol = params.get("symbol")
-                    volume = float(params.get("volume", 0))
-                    pair_id = str(params.get("pair_id"))
-                    magic = int(params.get("magic", 0))
-                    deviation = int(params.get("deviation", 20))
-                    if not symbol or volume <= 0:
-                        respond(req_id, "error", error="Invalid symbol or volume")
-                        continue
-                    ok, data = _submit_market_order(
-                        symbol=symbol,
-                        side=cmd,
-                        volume=volume,
-                        comment=f"PAIR:{pair_id}",
-                        magic=magic,
-                        deviation=deviation,
-                    )
-                    if not ok:
-                        respond(req_id, "error", error=str(data.get("error")))
-                    else:
-                        respond(req_id, "ok", data=data)
+                elif cmd == "watch_profits":
+                    tickets = {int(t) for t in (params.get("tickets") or []) if int(t) > 0}
+                    watch_interval = max(0.05, float(params.get("interval", watch_interval)))
+                    # Keep the last sent figures for tickets still watched so
+                    # re-subscribing does not resend unchanged profits.
+                    watched = {t: watched.get(t) for t in tickets}
+                    next_watch = 0.0
+                    respond(req_id, "ok", data={"watching": len(watched)})
 
-                elif cmd == "get_profit":
-                    position_ticket = int(params.get("position_ticket", 0))
-                    ok, data = _get_profit_by_ticket(position_ticket)
-                    if not ok:
-                        respond(req_id, "error", error=str(data.get("error")))
-                    else:
-                        respond(req_id, "ok", data=data)
-
-                elif cmd == "get_quote":
-                    symbol = params.get("symbol")
-                    ok, data = _get_quote(str(symbol or ""))
-                    if not ok:
-                        respond(req_id, "error", error=str(data.get("error")))
-                    else:
-                        respond(req_id, "ok", data=data)
-
-                elif cmd == "get_account_info":
-                    ok, data = _get_account_overview()
-                    if not ok:
-                        respond(req_id, "error", error=str(data.get("error")))
-                    else:
-                        respond(req_id, "ok", data=data)
-
-                elif cmd == "close":
-                    if not connected:
-                        respond(req_id, "error", error="Not connected")
-                        continue
-                    position_ticket = int(params.get("position_ticket", 0))
-                    symbol = params.get("symbol")
-                    side = params.get("side")
-                    volume = float(params.get("volume", 0))
-                    magic = int(params.get("magic", 0))
-                    deviation = int(params.get("deviation", 20))
-                    if position_ticket <= 0 or not symbol or volume <= 0:
-                        respond(req_id, "error", error="Invalid close params")
-                        continue
-                    ok, data = _close_position_by_ticket(
-                        position_ticket=position_ticket,
-                        symbol=symbol,
-                        side=str(side or ""),
-                        volume=volume,
-                        magic=magic,
-                        deviation=deviation,
-                    )
-                    if not ok:
-                        respond(req_id, "error", error=str(data.get("error")))
-                    else:
-                        respond(req_id, "ok", data=data)
+                elif cmd == "batch":
+                    respond(req_id, "ok", data=_run_batch(params.get("ops") or [], connected))
 
                 elif cmd == "shutdown":
                     respond(req_id, "ok", data={"shutdown": True})
@@ -461,7 +716,11 @@ def worker_main(request_queue, response_queue, terminal_path: Optional[str] = No
                     respond(req_id, "error", error=f"Unknown cmd: {cmd}")
 
             except Exception as e:  # pragma: no cover
-                respond(req_id, "error", error=f"{e}\n{traceback.format_exc()}")
+                # The caller gets the message; the stack goes to this worker's
+                # stderr instead of being pickled into every error reply.
+                print(f"[{label or 'worker'}] {cmd} failed:", file=sys.stderr)
+                traceback.print_exc(file=sys.stderr)
+                respond(req_id, "error", error=f"{type(e).__name__}: {e}")
 
     finally:
         try:
@@ -469,5 +728,9 @@ def worker_main(request_queue, response_queue, terminal_path: Optional[str] = No
                 MT5.shutdown()
         except Exception:
             pass
+        try:
+            conn.close()
+        except Exception:
+            pass
 
 
@@ -3,10 +3,31 @@ from __future__ import annotations
 import json
 import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Optional
 
 from automation import AppConfig, AutomationState
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def _dump_json(payload: object, indent: bool = True) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(payload, option=option)
+    if indent:
+        return json.dumps(payload, indent=2).encode("utf-8")
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _read_json(path: Path) -> object:
+    raw = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class Persistence:
     """Simple JSON-backed persistence for automation settings/state."""
@@ -17,6 +38,10 @@ class Persistence:
         self._lock = threading.Lock()
         self._config = AppConfig()
         self._state = AutomationState()
+        # Detached copy handed out by get_config(); rebuilt once per save_config().
+        self._config_cache: Optional[AppConfig] = None
+        # Bumped on every state replacement so pollers can skip unchanged reloads.
+        self._state_version = 0
         self._load()
         self._ensure_files_exist()
 
@@ -24,8 +49,7 @@ class Persistence:
         combined_data: Optional[object] = None
         if self._state_path.exists():
             try:
-                with self._state_path.open("r", encoding="utf-8") as fh:
-                    combined_data = json.load(fh)
+                combined_data = _read_json(self._state_path)
             except Exception:
                 combined_data = None
 
@@ -52,8 +76,7 @@ class Persistence:
         if not self._config_path.exists():
             return False
         try:
-            with self._config_path.open("r", encoding="utf-8") as fh:
-                data = json.load(fh)
+            data = _read_json(self._config_path)
         except Exception:
             return False
         if isinstance(data, dict):
@@ -73,8 +96,7 @@ class Persistence:
             if not self._state_path.exists():
                 return False
             try:
-                with self._state_path.open("r", encoding="utf-8") as fh:
-                    data = json.load(fh)
+                data = _read_json(self._state_path)
             except Exception:
                 return False
         payload = None
@@ -97,36 +119,72 @@ class Persistence:
             self._write_state()
 
     def _write_config(self) -> None:
-        payload: Dict[str, object] = self._config.to_dict()
-        self._config_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = self._config_path.with_suffix(".tmp")
-        with tmp_path.open("w", encoding="utf-8") as fh:
-            json.dump(payload, fh, indent=2)
-        tmp_path.replace(self._config_path)
+        self._replace_file(self._config_path, _dump_json(self._config.to_dict()))
 
     def _write_state(self) -> None:
-        payload: Dict[str, object] = {"state": self._state.to_dict()}
-        self._state_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = self._state_path.with_suffix(".tmp")
-        with tmp_path.open("w", encoding="utf-8") as fh:
-            json.dump(payload, fh, indent=2)
-        tmp_path.replace(self._state_path)
+        # The state file is machine-written and grows with trade history, so it
+        # is stored compact; the hand-edited config keeps its indentation.
+        self._replace_file(self._state_path, _dump_json({"state": self._state.to_dict()}, indent=False))
+
+    @staticmethod
+    def _replace_file(path: Path, data: bytes) -> None:
+        # Temp file + rename keeps the old file intact if a write is cut short.
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(data)
+        except FileNotFoundError:
+            # The directory is missing (first run or removed since); create it
+            # here rather than stat-ing it before every write.
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(data)
+        tmp_path.replace(path)
 
     def get_config(self) -> AppConfig:
+        """Return the current config; the instance is shared, treat it as read-only."""
+        # Writers only ever swap whole references, so the common cached case
+        # needs no lock and never waits behind a disk write.
+        cached = self._config_cache
+        if cached is not None:
+            return cached
         with self._lock:
-            return AppConfig.from_dict(self._config.to_dict())
+            if self._config_cache is None:
+                self._config_cache = AppConfig.from_dict(self._config.to_dict())
+            return self._config_cache
 
     def save_config(self, config: AppConfig) -> None:
         with self._lock:
             self._config = config
+            self._config_cache = None
             self._write_config()
 
     def get_state(self) -> AutomationState:
-        with self._lock:
-            return AutomationState.from_dict(self._state.to_dict())
+        # Lock-free like get_config: save/set_state replace the reference, so
+        # this reads one consistent state even while the writer holds the lock.
+        state = self._state
+        # from_dict already copies every entry, so feeding it the live
+        # containers gives the same detached copy without a to_dict() pass.
+        return AutomationState.from_dict({
+            "last_runs": state.last_runs,
+            "trade_history": state.trade_history,
+            "active_trades": state.active_trades,
+        })
+
+    @property
+    def state_version(self) -> int:
+        return self._state_version
 
     def save_state(self, state: AutomationState) -> None:
         with self._lock:
             self._state = state
+            self._state_version += 1
             self._write_state()
 
+    def set_state(self, state: AutomationState) -> None:
+        """Update the in-memory state without touching disk (see flush_state)."""
+        with self._lock:
+            self._state = state
+            self._state_version += 1
+
+    def flush_state(self) -> None:
+        with self._lock:
+            self._write_state()
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import os
+import subprocess
 import sys
-import threading
 import unittest
 from datetime import datetime, time, timedelta, timezone
-from pathlib import Path
+from types import MappingProxyType
 
-sys.path.append(str(Path(__file__).resolve().parents[1]))
+# Make the repo root importable when run as `python -m unittest discover -s tests`.
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 from automation import (
     AppConfig,
@@ -15,20 +19,55 @@ from automation import (
     ThreadSchedule,
     TrackedTrade,
     drawdown_breached,
+    gather_tracked_trades,
     mark_schedule_triggered,
     parse_time_string,
     schedule_should_trigger,
     spreads_within_entry_limit,
     trades_due_for_close,
 )
-from main import App
+
+
+# Read-only spreads tight enough to satisfy a 0.5 exit limit.
+SPREADS_TIGHT = MappingProxyType({"EURUSD": 0.4, "USDJPY": 0.3})
+
+
+def _profit_config() -> AppConfig:
+    """Config with one EURUSD/USDJPY schedule that closes on combined profit."""
+    schedule = ThreadSchedule(
+        thread_id="primary-1",
+        name="Primary",
+        enabled=True,
+        symbol1="EURUSD",
+        symbol2="USDJPY",
+        close_condition="profit",
+        min_combined_profit=10.0,
+    )
+    return AppConfig(timezone="UTC", primary_threads=[schedule], wednesday_threads=[], risk=RiskConfig())
+
+
+def _paired(opened_at: float, profit1: float, profit2: float) -> dict:
+    """Return a fresh single-trade ``paired_trades`` map with the given leg profits."""
+    return {
+        "T100": {
+            "opened_at": opened_at,
+            "thread_id": "primary-1",
+            "account1": {"symbol": "EURUSD", "last_profit": profit1, "last_commission": -1.0, "last_swap": -0.5},
+            "account2": {"symbol": "USDJPY", "last_profit": profit2, "last_commission": -0.75, "last_swap": 0.25},
+        }
+    }
 
 
 class AutomationLogicTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Read-only fixtures shared by every test; datetimes are immutable.
+        cls.config = AppConfig()
+        cls.now = datetime(2024, 5, 6, 9, 30, tzinfo=timezone.utc)
+
     def setUp(self) -> None:
-        self.config = AppConfig()
+        # mark_schedule_triggered mutates the state, so each test gets its own.
         self.state = AutomationState()
-        self.now = datetime(2024, 5, 6, 9, 30, tzinfo=timezone.utc)
 
     def test_parse_time_string_invalid(self) -> None:
         self.assertIsNone(parse_time_string("bad"))
@@ -78,6 +117,33 @@ class AutomationLogicTests(unittest.TestCase):
         next_day = now + timedelta(days=7)
         self.assertTrue(schedule_should_trigger(schedule, next_day, self.state))
 
+    def test_trades_due_for_close_prefers_monotonic_hold_time(self) -> None:
+        # Wall clock says 65 minutes, monotonic clock says only 30 have elapsed.
+        opened = self.now - timedelta(minutes=65)
+        trade = TrackedTrade("T1", opened, ("EURUSD",), 60, 0.0, opened_monotonic=1000.0)
+        result = trades_due_for_close([trade], self.now, {}, {"T1": 0.0}, now_monotonic=1000.0 + 30 * 60)
+        self.assertEqual(result, [])
+
+        result = trades_due_for_close([trade], self.now, {}, {"T1": 0.0}, now_monotonic=1000.0 + 61 * 60)
+        self.assertEqual(result, [("T1", "spread")])
+
+    def test_schedule_empty_weekdays_allows_every_day(self) -> None:
+        schedule = ThreadSchedule(
+            thread_id="primary-1",
+            name="Primary Set 1",
+            enabled=True,
+            entry_start="09:15",
+            entry_end="09:45",
+            weekdays=[],
+        )
+
+        saturday = datetime(2024, 5, 11, 9, 20, tzinfo=timezone.utc)
+        self.assertTrue(schedule_should_trigger(schedule, saturday, self.state))
+
+    def test_schedule_weekdays_set_wraps_out_of_range_days(self) -> None:
+        schedule = ThreadSchedule(thread_id="primary-1", name="Primary Set 1", weekdays=[7, 9])
+        self.assertEqual(schedule.weekdays_set, frozenset({0, 2}))
+
     def test_trades_due_for_close_by_duration(self) -> None:
         opened = self.now - timedelta(minutes=65)
         trade = TrackedTrade("T1", opened, ("EURUSD", "USDJPY"), 60, 0.0)
@@ -92,22 +158,20 @@ class AutomationLogicTests(unittest.TestCase):
     def test_trades_due_for_close_by_spread(self) -> None:
         opened = self.now - timedelta(minutes=10)
         trade = TrackedTrade("T2", opened, ("EURUSD", "USDJPY"), 0, 0.5)
-        spreads = {"EURUSD": 0.4, "USDJPY": 0.3}
         self.assertEqual(
-            trades_due_for_close([trade], self.now, spreads, {"T2": 0.0}),
+            trades_due_for_close([trade], self.now, SPREADS_TIGHT, {"T2": 0.0}),
             [("T2", "spread")],
         )
 
     def test_trade_waits_for_hold_time_before_spread_exit(self) -> None:
         opened = self.now - timedelta(minutes=10)
         trade = TrackedTrade("T3", opened, ("EURUSD", "USDJPY"), 60, 0.5)
-        spreads = {"EURUSD": 0.4, "USDJPY": 0.3}
         # Still within hold period, should not close
-        self.assertEqual(trades_due_for_close([trade], self.now, spreads, {"T3": 0.0}), [])
+        self.assertEqual(trades_due_for_close([trade], self.now, SPREADS_TIGHT, {"T3": 0.0}), [])
 
         later = self.now + timedelta(minutes=60)
         self.assertEqual(
-            trades_due_for_close([trade], later, spreads, {"T3": 0.0}),
+            trades_due_for_close([trade], later, SPREADS_TIGHT, {"T3": 0.0}),
             [("T3", "spread")],
         )
 
@@ -133,51 +197,40 @@ class AutomationLogicTests(unittest.TestCase):
         )
 
     def test_gather_active_trades_uses_running_profit(self) -> None:
-        schedule = ThreadSchedule(
-            thread_id="primary-1",
-            name="Primary",
-            enabled=True,
-            symbol1="EURUSD",
-            symbol2="USDJPY",
-            close_condition="profit",
-            min_combined_profit=10.0,
-        )
-        config = AppConfig(
-            timezone="UTC",
-            primary_threads=[schedule],
-            wednesday_threads=[],
-            risk=RiskConfig(),
-        )
-        app = App.__new__(App)
-        app._trade_lock = threading.Lock()
+        config = _profit_config()
         now = datetime(2024, 5, 6, 12, 0, tzinfo=timezone.utc)
-        app.paired_trades = {
-            "T100": {
-                "opened_at": now.timestamp(),
-                "thread_id": "primary-1",
-                "account1": {
-                    "symbol": "EURUSD",
-                    "last_profit": 8.0,
-                    "last_commission": -1.0,
-                    "last_swap": -0.5,
-                },
-                "account2": {
-                    "symbol": "USDJPY",
-                    "last_profit": 5.0,
-                    "last_commission": -0.75,
-                    "last_swap": 0.25,
-                },
-            }
-        }
-        app.worker1 = None
-        app.worker2 = None
+        paired_trades = _paired(now.timestamp(), 8.0, 5.0)
+        thread_map = {thread.thread_id: thread for thread in config.primary_threads}
 
-        trades, requests, profits = app._gather_active_trades(now, config)
+        trades, requests, profits, _ = gather_tracked_trades(paired_trades, thread_map, now)
         self.assertEqual(len(trades), 1)
         self.assertEqual(len(requests), 2)
         # Combined profit should use the running PnL values only.
         expected_profit = 8.0 + 5.0
-        self.assertAlmostEqual(profits["T100"], expected_profit)
+        self.assertEqual(profits["T100"], expected_profit)
+
+    def test_app_gather_active_trades_wraps_tracked_trades(self) -> None:
+        # Imported here so filtered runs of the pure logic tests skip Tk/worker setup.
+        from main import App
+
+        config = _profit_config()
+        now = datetime(2024, 5, 6, 12, 0, tzinfo=timezone.utc)
+        app = App.__new__(App)
+        app.paired_trades = _paired(now.timestamp(), 8.0, 5.0)
+        app.worker1 = None
+        app.worker2 = None
+        app._thread_map_cache = None
+        app._opened_monotonic = {"T100": 1000.0}
+        app._opened_dt_cache = {}
+
+        trades, requests, profits = app._gather_active_trades(now, config)
+        self.assertEqual([trade.trade_id for trade in trades], ["T100"])
+        self.assertEqual(trades[0].close_condition, "profit")
+        self.assertEqual(trades[0].opened_monotonic, 1000.0)
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(profits["T100"], 13.0)
+        # The open datetime is cached for the next tick.
+        self.assertIn("T100", app._opened_dt_cache)
 
     def test_trades_due_for_close_respects_close_window(self) -> None:
         opened = self.now - timedelta(minutes=180)
@@ -225,41 +278,31 @@ class AutomationLogicTests(unittest.TestCase):
 
     def test_drawdown_detection(self) -> None:
         risk = RiskConfig(drawdown_enabled=True, drawdown_stop=5.0)
-        
-        # Test 1: Neither account breached (both under 5% loss)
-        # Account 1: (1000 - 960) / 1000 = 4% drawdown - OK
-        # Account 2: (2000 - 1920) / 2000 = 4% drawdown - OK
-        accounts = [{"balance": 1000, "equity": 960}, {"balance": 2000, "equity": 1920}]
-        self.assertFalse(drawdown_breached(risk, accounts))
-        
-        # Test 2: Account 1 breached (6% loss)
-        # Account 1: (1000 - 940) / 1000 = 6% drawdown - BREACHED
-        # Account 2: (2000 - 1980) / 2000 = 1% drawdown - OK
-        accounts = [{"balance": 1000, "equity": 940}, {"balance": 2000, "equity": 1980}]
-        self.assertTrue(drawdown_breached(risk, accounts))
-        
-        # Test 3: Account 2 breached (10% loss)
-        # Account 1: (1000 - 990) / 1000 = 1% drawdown - OK
-        # Account 2: (2000 - 1800) / 2000 = 10% drawdown - BREACHED
-        accounts = [{"balance": 1000, "equity": 990}, {"balance": 2000, "equity": 1800}]
-        self.assertTrue(drawdown_breached(risk, accounts))
-        
-        # Test 4: Both accounts breached
-        # Account 1: (1000 - 900) / 1000 = 10% drawdown - BREACHED
-        # Account 2: (2000 - 1800) / 2000 = 10% drawdown - BREACHED
-        accounts = [{"balance": 1000, "equity": 900}, {"balance": 2000, "equity": 1800}]
-        self.assertTrue(drawdown_breached(risk, accounts))
-        
-        # Test 5: Disabled drawdown should never trigger
+        # Drawdown is checked per account: (balance - equity) / balance.
+        cases = [
+            ("neither breached (4% / 4%)", [(1000, 960), (2000, 1920)], False),
+            ("account 1 breached (6% / 1%)", [(1000, 940), (2000, 1980)], True),
+            ("account 2 breached (1% / 10%)", [(1000, 990), (2000, 1800)], True),
+            ("both breached (10% / 10%)", [(1000, 900), (2000, 1800)], True),
+        ]
+        for label, figures, expected in cases:
+            with self.subTest(label):
+                accounts = [{"balance": balance, "equity": equity} for balance, equity in figures]
+                self.assertEqual(drawdown_breached(risk, accounts), expected)
+
+        # Disabled drawdown should never trigger
         risk_disabled = RiskConfig(drawdown_enabled=False, drawdown_stop=5.0)
         accounts = [{"balance": 1000, "equity": 500}, {"balance": 2000, "equity": 1000}]
         self.assertFalse(drawdown_breached(risk_disabled, accounts))
 
     def test_spread_entry_check(self) -> None:
-        spreads = {"EURUSD": 0.6, "USDJPY": 0.7}
-        self.assertTrue(spreads_within_entry_limit(["EURUSD", "USDJPY"], spreads, 0.8))
-        spreads["USDJPY"] = 1.0
-        self.assertFalse(spreads_within_entry_limit(["EURUSD", "USDJPY"], spreads, 0.8))
+        symbols = ["EURUSD", "USDJPY"]
+        for spreads, expected in (
+            ({"EURUSD": 0.6, "USDJPY": 0.7}, True),
+            ({"EURUSD": 0.6, "USDJPY": 1.0}, False),
+        ):
+            with self.subTest(spreads=spreads):
+                self.assertEqual(spreads_within_entry_limit(symbols, spreads, 0.8), expected)
 
     def test_duplicate_thread_ids_become_unique(self) -> None:
         data = {
@@ -338,7 +381,29 @@ class AutomationLogicTests(unittest.TestCase):
             weekdays=[0],
         )
         self.assertEqual(schedule_profit.close_condition, "profit")
-        self.assertAlmostEqual(schedule_profit.min_combined_profit, 7.5)
+        self.assertEqual(schedule_profit.min_combined_profit, 7.5)
+
+
+class ImportBudgetTests(unittest.TestCase):
+    # Run in a fresh interpreter so modules already loaded by this suite do not
+    # hide the cost; only the import itself is timed, not interpreter startup.
+    _PROBE = (
+        "import sys, time; t0 = time.perf_counter(); import automation; "
+        "print(time.perf_counter() - t0); "
+        "print(','.join(m for m in ('main', 'tkinter', 'MetaTrader5') if m in sys.modules))"
+    )
+
+    def test_automation_import_stays_light(self) -> None:
+        result = subprocess.run(
+            [sys.executable, "-c", self._PROBE],
+            cwd=_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        elapsed, heavy = result.stdout.splitlines()
+        self.assertEqual(heavy, "", "automation must not import GUI or broker modules")
+        self.assertLess(float(elapsed), 0.25)
 
 
 if __name__ == "__main__":